@@ -20,6 +20,18 @@ argument_parser.add_argument("--test-build", action="store_true")
 argument_parser.add_argument("--reset-build", action="store_true")
 argument_parser.add_argument("--run-unit-tests", action="store_true")
 argument_parser.add_argument("--profile", action="store_true")
+argument_parser.add_argument("--dump-bus-stats", metavar="PATH", type=Path)
+argument_parser.add_argument("--headless", metavar="ROM", type=Path)
+argument_parser.add_argument("--run-rom", metavar="PATH", type=Path)
+argument_parser.add_argument("--frames", metavar="N", type=int)
+argument_parser.add_argument("--profile-rom", metavar="PATH", type=Path)
+argument_parser.add_argument("--profile-output", metavar="PATH", type=Path, default=Path("profile.collapsed"))
+argument_parser.add_argument("--sample-interval", metavar="MS", type=float, default=1.0)
+argument_parser.add_argument("--benchmark", action="store_true")
+argument_parser.add_argument("--benchmark-output", metavar="PATH", type=Path)
+argument_parser.add_argument("--baseline", metavar="PATH", type=Path)
+argument_parser.add_argument("--threshold", metavar="FRACTION", type=float, default=0.25)
+argument_parser.add_argument("--save-baseline", action="store_true")
 arguments = argument_parser.parse_args()
 
 
@@ -81,6 +93,45 @@ def _run_src():
     run()
 
 
+def _run_headless(rom: Path, frames: int | None):
+    from project.src import headless
+
+    frames_run = headless.run(rom, frames)
+    print(f"Ran {frames_run} frames")
+
+
+def _run_rom(rom: Path, frames: int):
+    import json
+    from project.src import headless
+    from project.src.system import set_value, SystemEvents
+
+    # the report goes to stdout, so keep the log quiet
+    set_value("developer", "debug logging", False)
+    SystemEvents.SettingsUpdated()
+    print(json.dumps(headless.run_rom(rom, frames), indent=4))
+
+
+def _benchmark():
+    import sys
+    from benchmarks import suite
+    from project.src.system import set_value, SystemEvents
+
+    set_value("developer", "debug logging", False)
+    SystemEvents.SettingsUpdated()
+    baseline_path = arguments.baseline or suite.BASELINE_PATH
+    baseline = suite.load_baseline(baseline_path)
+    results = suite.run()
+    regressions = suite.report(results, baseline, arguments.threshold)
+    if arguments.benchmark_output:
+        suite.save_results(results, arguments.benchmark_output)
+    if baseline is None or arguments.save_baseline:
+        suite.save_results(results, baseline_path)
+        print(f"Baseline written to {baseline_path}")
+    elif regressions:
+        print(f"{len(regressions)} benchmarks are more than {arguments.threshold:.0%} slower than the baseline")
+        sys.exit(1)
+
+
 def _profile(func, *filenames):
     from cProfile import Profile
     print("Profiling...")
@@ -92,6 +143,37 @@ def _profile(func, *filenames):
     _extract_stats(profiler, *filenames)
 
 
+def _profile_rom(rom: Path, frames: int):
+    from project.src import headless
+    from project.src.profiler import SamplingProfiler
+    from project.src.system import SystemEvents
+
+    headless.load(rom)
+    try:
+        with SamplingProfiler(arguments.sample_interval / 1000) as profiler:
+            for _ in range(frames):
+                headless.run_frame()
+    finally:
+        SystemEvents.Quit()
+    profiler.write_collapsed(arguments.profile_output)
+    print(f"{len(profiler.samples)} stacks over {sum(profiler.samples.values()) / 1e6:.2f} s written to {arguments.profile_output}")
+
+
+def _instrument_bus():
+    from project.src.system import set_value, SystemEvents
+
+    set_value("developer", "instrument bus", True)
+    SystemEvents.SettingsUpdated()
+
+
+def _dump_bus_stats(path: Path):
+    import json
+    from project.src.system import SystemEvents
+
+    path.write_text(json.dumps(SystemEvents.RequestBusStats.request_data(), indent=4))
+    print(f"Bus stats written to {path}")
+
+
 def _extract_stats(profiler, *filenames):
     from pstats import Stats, SortKey
 
@@ -108,7 +190,19 @@ def main():
     elif arguments.run_unit_tests:
         _run_unit_tests()
     elif arguments.profile:
+        if arguments.dump_bus_stats:
+            _instrument_bus()
         _profile(_run_unit_tests, "memory.py", "bus.py", "cpu.py", "instruction.py", "system.py")
+        if arguments.dump_bus_stats:
+            _dump_bus_stats(arguments.dump_bus_stats)
+    elif arguments.profile_rom:
+        _profile_rom(arguments.profile_rom, arguments.frames or 60)
+    elif arguments.benchmark:
+        _benchmark()
+    elif arguments.run_rom:
+        _run_rom(arguments.run_rom, arguments.frames or 60)
+    elif arguments.headless:
+        _run_headless(arguments.headless, arguments.frames)
     else:
         _run_src()
 
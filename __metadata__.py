@@ -1,3 +1,4 @@
+import sys
 from datetime import date
 
 __egg__ = r"""
@@ -59,6 +60,7 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-print(__egg__, end="\n\n")
-print(__about__)
-print(__notice__)
+# the banner goes to stderr so stdout stays clean for machine readable output like --run-rom's
+print(__egg__, end="\n\n", file=sys.stderr)
+print(__about__, file=sys.stderr)
+print(__notice__, file=sys.stderr)
@@ -0,0 +1,23 @@
+from timeit import repeat
+
+NUMBER = 100_000
+REPEAT = 5
+
+
+def best(statement, number: int = 1) -> float:
+    """The fastest of REPEAT runs of number calls of statement, in seconds."""
+    return min(repeat(statement, number=number, repeat=REPEAT))
+
+
+def per_call(statement, number: int = NUMBER, unit: float = 1e9) -> float:
+    """The time a call of statement takes in the fastest run, in nanoseconds unless another unit is given."""
+    return best(statement, number) / number * unit
+
+
+def main(run):
+    """Run a benchmark from the command line, with debug logging off so the log isn't timed along with it."""
+    from project.src.system import set_value, SystemEvents
+
+    set_value("developer", "debug logging", False)
+    SystemEvents.SettingsUpdated()
+    run()
@@ -0,0 +1,60 @@
+import tempfile
+from pathlib import Path
+from project.src.components import battery, memory
+from ._common import main, per_call
+
+NUMBER = 100
+WRITES = 100_000
+SIZES = (0x2000, 0x8000, 0x20000)
+
+
+def _scan(size: int, saves: Path) -> dict:
+    """The flusher's once a second compare against the last flushed copy, clean and with one page written."""
+    ram = battery.BatteryRam(saves / f"{size}.sav", size)
+    try:
+        clean = per_call(ram._mark_dirty, NUMBER, 1e6)
+
+        def one_page():
+            ram.buffer[size // 2] ^= 0xFF
+            ram._mark_dirty()
+
+        written = per_call(one_page, NUMBER, 1e6)
+        return {"clean scan": clean, "one page scan": written}
+    finally:
+        ram.close()
+
+
+def _writes() -> dict:
+    """A cart RAM write through the page table, straight into a view or through a writer flagging its page."""
+    data = bytearray(battery.DIRTY_PAGE_SIZE)
+    dirty = bytearray(1)
+
+    def flag(address: int, value: int):
+        data[address & 0xFF] = value
+        dirty[0] = 1
+
+    direct = memoryview(data)
+    flagged = memory.MappedPage(0xA000, writer=flag)
+    per_write = {}
+    for name, page in (("direct write", direct), ("flagging write", flagged)):
+        per_write[name] = per_call(lambda: [page.__setitem__(0x12, 0x34) for _ in range(1000)], WRITES // 1000) / 1000
+    return per_write
+
+
+def run():
+    with tempfile.TemporaryDirectory() as saves:
+        results = {size: _scan(size, Path(saves)) for size in SIZES}
+    for size, result in results.items():
+        print(f"{size // 1024:>4} KiB  clean scan: {result['clean scan']:7.1f} us  one page scan: {result['one page scan']:7.1f} us")
+    writes = _writes()
+    for name, nanoseconds in writes.items():
+        print(f"{name:<15} {nanoseconds:7.1f} ns")
+    # flags only win if the game writes cart RAM fewer times a second than one scan costs in extra write time
+    extra = writes["flagging write"] - writes["direct write"]
+    for size, result in results.items():
+        print(f"{size // 1024:>4} KiB  break even at {result['one page scan'] * 1e3 / extra:9.0f} writes a second")
+    return results | writes
+
+
+if __name__ == "__main__":
+    main(run)
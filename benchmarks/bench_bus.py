@@ -0,0 +1,51 @@
+from enum import auto
+
+from project.src.system import bus
+from project.src.system.bus import Event, Priority
+from ._common import main, per_call
+
+
+class BenchEvents(Event):
+    NoSubscribers = auto()
+    OneSubscriber = auto()
+    ThreeSubscribers = auto()
+    Request = auto()
+
+
+def _noop(*_):
+    pass
+
+
+BenchEvents.OneSubscriber.subscribe(_noop)
+for priority in (Priority.LOW, Priority.CRITICAL, Priority.MEDIUM):
+    BenchEvents.ThreeSubscribers.subscribe(_noop, priority)
+BenchEvents.Request.allow_requests(_noop)
+
+
+def _nested_emit(event, *args, **kwargs):
+    """The emit loop as it was before dispatch tables, kept as the baseline."""
+    for priority in bus._broadcasts.get(event, {}).values():
+        for callback in priority:
+            callback(*args, **kwargs)
+
+
+def run():
+    results = {}
+    for event in (BenchEvents.NoSubscribers, BenchEvents.OneSubscriber, BenchEvents.ThreeSubscribers):
+        results[event.name] = {
+            "nested": per_call(lambda: _nested_emit(event, 1)),
+            "dispatch": per_call(lambda: event.emit(1)),
+        }
+    bound = BenchEvents.Request.bind()
+    requests = {
+        "request_data": per_call(lambda: BenchEvents.Request.request_data(1)),
+        "bound": per_call(lambda: bound(1)),
+    }
+    for name, timings in results.items():
+        print(f"{name:<20} nested: {timings['nested']:8.1f} ns  dispatch: {timings['dispatch']:8.1f} ns")
+    print(f"{'Request':<20} request_data: {requests['request_data']:8.1f} ns  bound: {requests['bound']:8.1f} ns")
+    return results | {"Request": requests}
+
+
+if __name__ == "__main__":
+    main(run)
@@ -0,0 +1,69 @@
+import os
+import resource
+import tracemalloc
+from array import array
+from time import perf_counter
+
+from project.src.components import cartridge
+from ._common import main
+
+SIZE_CODES = {size: code for code, size in cartridge.ROM_SIZES.items()}
+LARGEST = sorted(SIZE_CODES, reverse=True)[:3]
+
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # only the peak is available here, so growth is still visible but frees are not
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rom(size: int) -> bytes:
+    rom = bytearray(size)
+    rom[0x147] = 0x1B  # MBC5 + RAM + BATTERY
+    rom[0x148] = SIZE_CODES[size]
+    rom[0x149] = 0x04
+    return bytes(rom)
+
+
+def _copied(rom: bytes):
+    # the per bank copies Cart made before the banks became views, kept as the baseline
+    full = array("B", rom)
+    return full, [full[i : i + cartridge.ROM_BANK_SIZE] for i in range(0, len(full), cartridge.ROM_BANK_SIZE)]
+
+
+def _measure(load, rom: bytes) -> tuple[float, int, int]:
+    before = _rss()
+    start = perf_counter()
+    loaded = load(rom)
+    elapsed = perf_counter() - start
+    grown = _rss() - before
+    del loaded
+    # the allocator reuses freed pages between sizes, so the traced peak is the steadier number
+    tracemalloc.start()
+    loaded = load(rom)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del loaded
+    return elapsed * 1e3, grown, allocated
+
+
+def run():
+    results = {}
+    for size in LARGEST:
+        rom = _rom(size)
+        results[size] = {"copied": _measure(_copied, rom), "views": _measure(cartridge.Cart, rom)}
+        print(
+            f"{size // 1024:>5} KiB"
+            + "".join(
+                f"  {kind}: {ms:7.2f} ms rss +{rss / 2**20:5.1f} MiB allocated {allocated / 2**20:5.1f} MiB"
+                for kind, (ms, rss, allocated) in results[size].items()
+            )
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
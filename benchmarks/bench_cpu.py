@@ -0,0 +1,39 @@
+from project.src.components import cpu
+from project.src.system import ComponentEvents
+from ._common import best, main
+
+CYCLES = 200_000
+
+# LD B, 8; loop: INC A; ADD A, B; XOR C; LD D, A; SWAP D; DEC B; JR NZ, loop; JR start
+LOOP = [0x06, 0x08, 0x3C, 0x80, 0xA9, 0x57, 0xCB, 0x32, 0x05, 0x20, 0xF7, 0x18, 0xF3]
+LOOP_START = 0xFF80
+
+
+def _load_loop():
+    ComponentEvents.RequestReset()
+    for offset, value in enumerate(LOOP):
+        ComponentEvents.RequestMemoryWrite(LOOP_START + offset, value)
+    ComponentEvents.RequestRegisterWrite("PC", LOOP_START)
+
+
+def _run(step):
+    _load_loop()
+
+    def loop():
+        target = cpu.state.cycles + CYCLES
+        while cpu.state.cycles < target:
+            step()
+
+    return best(loop)
+
+
+def run():
+    results = {"interpreter": CYCLES / _run(cpu.step), "blocks": CYCLES / _run(cpu.step_block)}
+    for name, cycles_per_second in results.items():
+        print(f"{name:<12} {cycles_per_second / 1e6:8.3f} M cycles/s")
+    ComponentEvents.RequestReset()
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
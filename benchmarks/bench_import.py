@@ -0,0 +1,32 @@
+import shutil
+import subprocess
+import sys
+
+from project.src.system import cache_path
+from ._common import REPEAT, main
+
+_IMPORT = (
+    "import time; start = time.perf_counter(); import project.src.components; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _import_time() -> float:
+    result = subprocess.run([sys.executable, "-c", _IMPORT], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1]) * 1e3
+
+
+def run():
+    cold, warm = [], []
+    for _ in range(REPEAT):
+        # the cache is rebuilt by the cold import, so clearing it is safe
+        shutil.rmtree(cache_path, ignore_errors=True)
+        cold.append(_import_time())
+        warm.append(_import_time())
+    results = {"cold": min(cold), "warm": min(warm)}
+    print("".join(f"{kind}: {timing:7.1f} ms  " for kind, timing in results.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
@@ -0,0 +1,46 @@
+from project.src.components import cartridge, memory
+from ._common import main, per_call
+
+BANKS = 0x200
+
+
+def _rom() -> bytes:
+    rom = bytearray(cartridge.ROM_SIZES[0x08])
+    rom[0x147], rom[0x148], rom[0x149] = 0x1B, 0x08, 0x04
+    return bytes(rom)
+
+
+def _switching(read, write, reads_per_switch):
+    # MBC5 games write both bank registers and then read a few bytes, as a streaming or music driver does
+    def run():
+        for bank in range(BANKS):
+            write(0x2000, bank & 0xFF)
+            write(0x3000, bank >> 8)
+            for _ in range(reads_per_switch):
+                read(0x4000)
+    return run
+
+
+def run():
+    memory.load_cartridge(_rom())
+    cart = memory.cart
+    results = {}
+    try:
+        for reads in (1, 16):
+            results[f"switch + {reads} read"] = {
+                "cart": per_call(_switching(cart.read, cart.write, reads), 50) / BANKS,
+                "memory": per_call(_switching(memory.read, memory.write, reads), 50) / BANKS,
+            }
+        results["read"] = {
+            "cart": per_call(lambda: cart.read(0x4000)),
+            "memory": per_call(lambda: memory.read(0x4000)),
+        }
+    finally:
+        memory.unload_cartridge()
+    for name, timings in results.items():
+        print(f"{name:<18}" + "".join(f" {kind}: {timing:8.1f} ns" for kind, timing in timings.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
@@ -0,0 +1,50 @@
+from random import Random
+from project.src.components import memory, ppu
+from ._common import best, main
+
+
+
+def _scene(sprites: bool, window: bool):
+    rng = Random(0)
+    memory.write_block(0x8000, rng.randbytes(0x2000))
+    # 40 sprites spread down the screen, two or three on every line
+    oam = bytearray()
+    for index in range(40):
+        oam += bytes([16 + index % 18 * 8, 8 + index * 4, index, index * 0x30 & 0xF0])
+    memory.write_block(0xFE00, oam)
+    ppu.boot()
+    memory.write(0xFF40, 0x91 | sprites << 1 | window << 5)
+    memory.write(0xFF4A, 40)
+    memory.write(0xFF4B, 60)
+
+
+def _frame():
+    ppu.state.window_line = 0
+    for ly in range(ppu.HEIGHT):
+        ppu.render_line(ly)
+
+
+def run():
+    results = {}
+    for name, sprites, window in (("background", False, False), ("window", False, True), ("sprites", True, True)):
+        _scene(sprites, window)
+        results[name] = best(_frame) * 1e3
+    # a sprite's tile rewritten every frame, as animated tiles are
+    _scene(True, True)
+    ppu.tile_cache.reset_stats()
+
+    def animated():
+        memory.write_block(0x8000, bytes(16))
+        _frame()
+
+    results["animated"] = best(animated) * 1e3
+    hit_rate = ppu.tile_cache.hit_rate
+    memory.write(0xFF40, 0x00)
+    for name, milliseconds in results.items():
+        print(f"{name:<12} {milliseconds:8.3f} ms/frame")
+    print(f"tile cache hit rate while animated: {hit_rate:.2%}")
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
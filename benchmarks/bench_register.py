@@ -0,0 +1,67 @@
+import array
+from functools import partial
+
+from project.src.components import register
+from ._common import main, per_call
+
+# the array backed register module as it was before RegisterFile, kept as the baseline
+_registry = array.array("B", [0] * 16)
+_set_8 = lambda i, v: _registry.__setitem__(i, v & 0xFF)
+_set_16 = lambda i, v: _registry.__setitem__(slice(i, i + 2), array.array("B", [v >> 8, v & 0xFF]))
+_get_8 = lambda i: _registry[i]
+_get_16 = lambda i: int.from_bytes(_registry[slice(i, i + 2)], byteorder="big")
+_make_regs = lambda regs: {
+    c: (partial(_set_16 if len(c) == 2 else _set_8, i), partial(_get_16 if len(c) == 2 else _get_8, i))
+    for i, c in enumerate(regs)
+}
+_8_bit_regs = _make_regs(["A", "F", "B", "C", "D", "E", "H", "L"])
+_16_bit_regs = _make_regs(["AF", "BC", "DE", "HL"])
+
+
+def _array_set(register, value):
+    match register:
+        case "A" | "F" | "B" | "C" | "D" | "E" | "H" | "L":
+            _8_bit_regs[register][0](value)
+        case "AF" | "BC" | "DE" | "HL":
+            _16_bit_regs[register][0](value)
+
+
+def _array_get(register):
+    match register:
+        case "A" | "F" | "B" | "C" | "D" | "E" | "H" | "L":
+            return _8_bit_regs[register][1]()
+        case "AF" | "BC" | "DE" | "HL":
+            return _16_bit_regs[register][1]()
+
+
+def run():
+    registry = register.registry
+    results = {
+        "write 8": {
+            "array": per_call(lambda: _array_set("B", 0x12)),
+            "event": per_call(lambda: register.set_register("B", 0x12)),
+            "direct": per_call(lambda: setattr(registry, "B", 0x12)),
+        },
+        "read 8": {
+            "array": per_call(lambda: _array_get("B")),
+            "event": per_call(lambda: register.get_register("B")),
+            "direct": per_call(lambda: registry.B),
+        },
+        "write 16": {
+            "array": per_call(lambda: _array_set("HL", 0x1234)),
+            "event": per_call(lambda: register.set_register("HL", 0x1234)),
+            "direct": per_call(lambda: setattr(registry, "HL", 0x1234)),
+        },
+        "read 16": {
+            "array": per_call(lambda: _array_get("HL")),
+            "event": per_call(lambda: register.get_register("HL")),
+            "direct": per_call(lambda: registry.HL),
+        },
+    }
+    for name, timings in results.items():
+        print(f"{name:<10}" + "".join(f" {kind}: {timing:8.1f} ns" for kind, timing in timings.items()))
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
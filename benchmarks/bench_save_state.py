@@ -0,0 +1,34 @@
+from project.src.components import memory, save_state
+from ._common import main, per_call
+
+NUMBER = 1_000
+
+
+def _rom() -> bytes:
+    rom = bytearray(0x200000)
+    rom[0x147], rom[0x148], rom[0x149] = 0x1A, 0x06, 0x04  # MBC5 + RAM, 2 MiB ROM, 128 KiB RAM
+    return bytes(rom)
+
+
+def run():
+    results = {}
+    for name, rom in (("no cart", None), ("128 KiB cart RAM", _rom())):
+        if rom is not None:
+            memory.load_cartridge(rom)
+        state = save_state.capture()
+        results[name] = {
+            "size": len(state),
+            "capture": per_call(save_state.capture, NUMBER, 1e6),
+            "restore": per_call(lambda: save_state.restore(state), NUMBER, 1e6),
+        }
+    memory.unload_cartridge()
+    for name, result in results.items():
+        print(
+            f"{name:<18} {result['size']:>7} bytes"
+            f"  capture: {result['capture']:7.1f} us  restore: {result['restore']:7.1f} us"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main(run)
@@ -0,0 +1,165 @@
+import json
+from enum import auto
+from pathlib import Path
+
+from project.src.system import ComponentEvents, Event
+from project.src.components import cartridge, cpu, memory, ppu, register
+from ._common import main, per_call
+
+NUMBER = 20_000
+THRESHOLD = 0.25
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# one address in every region of the memory map
+REGIONS = {
+    "rom bank 0": 0x0150,
+    "rom bank n": 0x4150,
+    "vram": 0x8150,
+    "cart ram": 0xA150,
+    "wram": 0xC150,
+    "echo ram": 0xE150,
+    "oam": 0xFE50,
+    "io": 0xFF40,
+    "hram": 0xFF90,
+    "ie": 0xFFFF,
+}
+# LD B, 8; loop: INC A; ADD A, B; XOR C; LD D, A; SWAP D; DEC B; JR NZ, loop; JR start
+LOOP = bytes([0x06, 0x08, 0x3C, 0x80, 0xA9, 0x57, 0xCB, 0x32, 0x05, 0x20, 0xF7, 0x18, 0xF3])
+LOOP_START = 0xC000
+
+
+class SuiteEvents(Event):
+    Emit = auto()
+    Request = auto()
+
+
+def _noop(*_):
+    pass
+
+
+SuiteEvents.Emit.subscribe(_noop)
+SuiteEvents.Request.allow_requests(_noop)
+
+
+def _per_call(statement, number: int = NUMBER) -> float:
+    return per_call(statement, number)
+
+
+def _rom(cartridge_type: int, rom_size: int, ram_size: int) -> bytes:
+    rom = bytearray(cartridge.ROM_SIZES[rom_size])
+    rom[0x134:0x13F] = b"BENCHMARK\0\0"
+    rom[0x147], rom[0x148], rom[0x149] = cartridge_type, rom_size, ram_size
+    return bytes(rom)
+
+
+def _bus() -> dict:
+    bound = SuiteEvents.Request.bind()
+    return {
+        "bus emit": _per_call(lambda: SuiteEvents.Emit.emit(1)),
+        "bus request_data": _per_call(lambda: SuiteEvents.Request.request_data(1)),
+        "bus bound request": _per_call(lambda: bound(1)),
+    }
+
+
+def _registers() -> dict:
+    return {
+        "register write 8": _per_call(lambda: register.set_register("B", 0x12)),
+        "register read 8": _per_call(lambda: register.get_register("B")),
+        "register write 16": _per_call(lambda: register.set_register("HL", 0x1234)),
+        "register read 16": _per_call(lambda: register.get_register("HL")),
+    }
+
+
+def _memory() -> dict:
+    results = {}
+    memory.write(0x0000, 0x0A)
+    for region, address in REGIONS.items():
+        results[f"memory read {region}"] = _per_call(lambda: memory.read(address))
+        if not region.startswith("rom"):
+            results[f"memory write {region}"] = _per_call(lambda: memory.write(address, 0x12))
+    results["memory bank switch"] = _per_call(lambda: (memory.write(0x2000, 2), memory.write(0x2000, 3)), NUMBER // 10) / 2
+    return results
+
+
+def _dispatch() -> dict:
+    results = {}
+    # NOP, INC A, ADD A, B, SWAP D through the handler tables
+    for op_code in (0x00, 0x3C, 0x80):
+        results[f"dispatch op {op_code:02X}"] = _per_call(lambda: cpu.handlers[op_code]())
+    results["dispatch cb 32"] = _per_call(lambda: cpu.cb_handlers[0x32]())
+
+    def per_cycle(step):
+        ComponentEvents.RequestReset()
+        memory.write_block(LOOP_START, LOOP)
+        register.registry.PC = LOOP_START
+
+        def run():
+            target = cpu.state.cycles + 10_000
+            while cpu.state.cycles < target:
+                step()
+
+        return _per_call(run, NUMBER // 1000) / 10_000
+
+    results["cpu interpreter per cycle"] = per_cycle(cpu.step)
+    results["cpu blocks per cycle"] = per_cycle(cpu.step_block)
+    return results
+
+
+def _video() -> dict:
+    # a line with the window over the background and ten sprites across it
+    memory.write_block(0x8000, bytes(range(0x100)) * 0x20)
+    memory.write_block(0xFE00, b"".join(bytes([88, 8 + index * 16, index, index << 4 & 0x30]) for index in range(10)))
+    ppu.boot()
+    memory.write(0xFF40, 0xB3)
+    memory.write(0xFF4B, 80)
+    ppu.render_line(0)
+    results = {"ppu render line": _per_call(lambda: ppu.render_line(72), NUMBER // 10)}
+    memory.write(0xFF40, 0x00)
+    return results
+
+
+def _headers() -> dict:
+    roms = [_rom(0x00, 0x00, 0x00), _rom(0x1B, 0x08, 0x04), _rom(0x13, 0x06, 0x03)]
+    return {"get_header_data": _per_call(lambda: [cartridge.get_header_data(rom) for rom in roms], NUMBER // 10) / len(roms)}
+
+
+def run() -> dict:
+    """Run every benchmark and return the nanoseconds per operation for each."""
+    memory.load_cartridge(_rom(0x1A, 0x06, 0x03))
+    try:
+        return _bus() | _registers() | _memory() | _dispatch() | _video() | _headers()
+    finally:
+        memory.unload_cartridge()
+
+
+def compare(results: dict, baseline: dict, threshold: float = THRESHOLD) -> dict:
+    """Return the benchmarks more than threshold slower than the baseline, with their slowdown ratios."""
+    return {
+        name: timing / baseline[name]
+        for name, timing in results.items()
+        if name in baseline and timing > baseline[name] * (1 + threshold)
+    }
+
+
+def report(results: dict, baseline: dict | None = None, threshold: float = THRESHOLD) -> dict:
+    regressions = compare(results, baseline, threshold) if baseline else {}
+    for name, timing in results.items():
+        line = f"{name:<28} {timing:10.1f} ns"
+        if baseline and name in baseline:
+            line += f"  {timing / baseline[name]:6.2f}x baseline"
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line)
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict | None:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save_results(results: dict, path: Path):
+    path.write_text(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main(lambda: report(run(), load_baseline()))
@@ -1,9 +1,11 @@
 from .system import bus
 from .components import *
-from .gui import *
 from . import structs
 
 def run():
+    # the GUI pulls in tkinter and PIL, so it's only imported when it's actually shown
+    from .gui import MainWindow
+
     main_window = MainWindow()
     main_window.mainloop()
 
@@ -1,10 +1,13 @@
-from . import register, cpu, instruction, memory, ppu
+from . import register, alu, cpu, instruction, memory, ppu, save_state, rewind
 
 
 __all__ = [
     "register",
+    "alu",
     "cpu",
     "instruction",
     "memory",
     "ppu",
+    "save_state",
+    "rewind",
 ]
@@ -0,0 +1,126 @@
+from array import array
+
+from project.src.system import cached, source_key
+
+# Every table entry packs the result in the low byte and the new F register in the high byte,
+# so an instruction is one index, the result is entry & 0xFF and F is entry >> 8.
+# ADD and SUB are indexed by carry << 16 | a << 8 | b, AND/XOR/OR by a << 8 | b, the unary
+# operations by carry << 8 | value and DAA by (F >> 4 & 0x7) << 8 | A, carry being the C flag
+# going into the instruction.
+
+Z_FLAG = 0x80
+N_FLAG = 0x40
+H_FLAG = 0x20
+C_FLAG = 0x10
+
+
+def _pack(result: int, n: int, h: bool, c: bool) -> int:
+    result &= 0xFF
+    return ((result == 0) << 7 | n << 6 | h << 5 | c << 4) << 8 | result
+
+
+def _add(a: int, b: int, carry: int) -> int:
+    return _pack(a + b + carry, 0, (a & 0xF) + (b & 0xF) + carry > 0xF, a + b + carry > 0xFF)
+
+
+def _sub(a: int, b: int, carry: int) -> int:
+    return _pack(a - b - carry, 1, (a & 0xF) - (b & 0xF) - carry < 0, a - b - carry < 0)
+
+
+def _binary(operation) -> array:
+    return array("H", [operation(a, b, carry) for carry in (0, 1) for a in range(0x100) for b in range(0x100)])
+
+
+def _logical(operation) -> array:
+    return array("H", [operation(a, b) for a in range(0x100) for b in range(0x100)])
+
+
+def _unary(operation) -> array:
+    return array("H", [operation(value, carry) for carry in (0, 1) for value in range(0x100)])
+
+
+def _daa(flags: int, a: int) -> int:
+    n, h, c = flags >> 2 & 1, flags >> 1 & 1, flags & 1
+    if n:
+        if c:
+            a -= 0x60
+        if h:
+            a -= 0x06
+    else:
+        if c or a > 0x99:
+            a += 0x60
+            c = 1
+        if h or a & 0x0F > 0x09:
+            a += 0x06
+    return _pack(a, n, False, c)
+
+
+def _build_tables() -> dict:
+    tables = {
+        "ADD": _binary(_add),
+        "SUB": _binary(_sub),
+        "AND": _logical(lambda a, b: _pack(a & b, 0, True, False)),
+        "XOR": _logical(lambda a, b: _pack(a ^ b, 0, False, False)),
+        "OR": _logical(lambda a, b: _pack(a | b, 0, False, False)),
+        "INC": _unary(lambda value, carry: _pack(value + 1, 0, value & 0xF == 0xF, carry)),
+        "DEC": _unary(lambda value, carry: _pack(value - 1, 1, value & 0xF == 0, carry)),
+        "RLC": _unary(lambda value, _: _pack(value << 1 | value >> 7, 0, False, value >> 7)),
+        "RRC": _unary(lambda value, _: _pack(value >> 1 | value << 7, 0, False, value & 1)),
+        "RL": _unary(lambda value, carry: _pack(value << 1 | carry, 0, False, value >> 7)),
+        "RR": _unary(lambda value, carry: _pack(value >> 1 | carry << 7, 0, False, value & 1)),
+        "SLA": _unary(lambda value, _: _pack(value << 1, 0, False, value >> 7)),
+        "SRA": _unary(lambda value, _: _pack(value >> 1 | value & 0x80, 0, False, value & 1)),
+        "SRL": _unary(lambda value, _: _pack(value >> 1, 0, False, value & 1)),
+        "SWAP": _unary(lambda value, _: _pack(value << 4 | value >> 4, 0, False, False)),
+        "DAA": array("H", [_daa(flags, a) for flags in range(8) for a in range(0x100)]),
+    }
+    # the accumulator rotates always clear Z
+    for name in ("RLC", "RRC", "RL", "RR"):
+        tables[f"{name}A"] = array("H", [entry & 0x7FFF for entry in tables[name]])
+    return {name: table.tobytes() for name, table in tables.items()}
+
+
+def _load(table: bytes) -> array:
+    loaded = array("H")
+    loaded.frombytes(table)
+    return loaded
+
+
+# building the tables takes a good part of a second, so they're cached until this file changes
+_tables = cached("alu", source_key(__file__), _build_tables)
+
+ADD, SUB, AND, XOR, OR = (_load(_tables[name]) for name in ("ADD", "SUB", "AND", "XOR", "OR"))
+INC, DEC = _load(_tables["INC"]), _load(_tables["DEC"])
+RLC, RRC, RL, RR = (_load(_tables[name]) for name in ("RLC", "RRC", "RL", "RR"))
+SLA, SRA, SRL, SWAP = (_load(_tables[name]) for name in ("SLA", "SRA", "SRL", "SWAP"))
+RLCA, RRCA, RLA, RRA = (_load(_tables[name]) for name in ("RLCA", "RRCA", "RLA", "RRA"))
+DAA = _load(_tables["DAA"])
+del _tables
+
+
+__all__ = [
+    "Z_FLAG",
+    "N_FLAG",
+    "H_FLAG",
+    "C_FLAG",
+    "ADD",
+    "SUB",
+    "AND",
+    "XOR",
+    "OR",
+    "INC",
+    "DEC",
+    "RLC",
+    "RRC",
+    "RL",
+    "RR",
+    "SLA",
+    "SRA",
+    "SRL",
+    "SWAP",
+    "RLCA",
+    "RRCA",
+    "RLA",
+    "RRA",
+    "DAA",
+]
@@ -0,0 +1,87 @@
+import mmap
+import threading
+from pathlib import Path
+
+from project.src.system import LogEvent
+
+DIRTY_PAGE_SIZE = 0x100
+FLUSH_INTERVAL = 1.0
+
+
+class BatteryRam:
+    """Cart RAM mapped onto a .sav file, with changed pages flushed to disk from a background thread.
+
+    Writes land straight in the mapping, so the emulation thread never waits on disk. Once a second
+    the flusher compares the RAM with what it last flushed, halving down to the 256 byte pages that
+    changed, marks those dirty and syncs only the OS pages they fall in."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        with open(path, "r+b") as save_file:
+            if save_file.seek(0, 2) < size:
+                save_file.truncate(size)
+            self.buffer = mmap.mmap(save_file.fileno(), size)
+        self.flushed = bytearray(self.buffer)
+        self.dirty = bytearray(-(-size // DIRTY_PAGE_SIZE))
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, name=f"flush {path.name}", daemon=True)
+        self._thread.start()
+        LogEvent.LogInfo("Mapped battery RAM to %s", path)
+
+    def _flush_periodically(self):
+        while not self._closed.wait(FLUSH_INTERVAL):
+            self.flush()
+
+    def _mark_dirty(self):
+        current = self.buffer[:]
+        if current != self.flushed:
+            self._mark_changed(current, 0, len(current))
+
+    def _mark_changed(self, current: bytes, start: int, end: int):
+        # halves that still match what was flushed are skipped whole, so a few written pages are found
+        # in a handful of compares rather than one per page
+        if end - start <= DIRTY_PAGE_SIZE:
+            self.dirty[start // DIRTY_PAGE_SIZE] = 1
+            self.flushed[start:end] = current[start:end]
+            return
+        middle = (start + end) // 2 // DIRTY_PAGE_SIZE * DIRTY_PAGE_SIZE
+        for low, high in ((start, middle), (middle, end)):
+            if current[low:high] != self.flushed[low:high]:
+                self._mark_changed(current, low, high)
+
+    def _dirty_ranges(self):
+        page = 0
+        while page < len(self.dirty):
+            if not self.dirty[page]:
+                page += 1
+                continue
+            start = page
+            while page < len(self.dirty) and self.dirty[page]:
+                self.dirty[page] = 0
+                page += 1
+            # msync only takes offsets aligned to the OS page size
+            offset = start * DIRTY_PAGE_SIZE // mmap.ALLOCATIONGRANULARITY * mmap.ALLOCATIONGRANULARITY
+            yield offset, min(page * DIRTY_PAGE_SIZE, len(self.buffer)) - offset
+
+    def flush(self) -> int:
+        """Sync the pages written since the last flush and return how many 256 byte pages were dirty."""
+        with self._lock:
+            if self.buffer.closed:
+                return 0
+            self._mark_dirty()
+            dirty = self.dirty.count(1)
+            for offset, size in self._dirty_ranges():
+                self.buffer.flush(offset, size)
+            return dirty
+
+    def close(self):
+        """Stop the flusher and write out anything left; the mapping itself goes once nothing views it."""
+        self._closed.set()
+        self._thread.join()
+        self.flush()
+
+
+__all__ = ["BatteryRam", "DIRTY_PAGE_SIZE", "FLUSH_INTERVAL"]
@@ -2,9 +2,11 @@ import struct
 from array import array
 from collections import namedtuple
 from enum import Flag, auto
+from pathlib import Path
 from types import MappingProxyType
 
 from project.src.system import LogEvent, ComponentEvents
+from .battery import BatteryRam
 
 
 class CartType(Flag):
@@ -312,7 +314,7 @@ ROM_SIZES = MappingProxyType(
         0x54: 0x180000,
     }
 )
-RAM_SIZES = MappingProxyType({0x00: 0x0000, 0x01: 0x0002, 0x02: 0x0008, 0x03: 0x0020, 0x04: 0x0080, 0x05: 0x0200})
+RAM_SIZES = MappingProxyType({0x00: 0x0000, 0x01: 0x0800, 0x02: 0x2000, 0x03: 0x8000, 0x04: 0x20000, 0x05: 0x10000})
 DESTINATION_CODES = MappingProxyType(
     {
         0x00: "Japanese",
@@ -354,40 +356,301 @@ def get_header_data(rom: array):
     # header checksum is sum all the header bytes together except the checksum bytes
     mapping["header_checksum"] = calculate_checksum(mapping["header_checksum"], rom)
     header_data = HeaderData(**mapping)
-    LogEvent.LogDebug(f"ROM Header Data: {header_data}")
+    LogEvent.LogDebug("ROM Header Data: %s", header_data)
     ComponentEvents.HeaderLoaded(header_data)
     return header_data
 
 
+OPEN_BUS = memoryview(bytes([0xFF] * RAM_BANK_SIZE))
+
+
 class Cart:
-    def __init__(self, rom: array):
-        self.rom = rom
-        self.header = get_header_data(self.rom)
-        self.rom_bank_0 = self.rom[0x0000 : ROM_BANK_SIZE]
-        self.rom_banks_n = [self.rom[i : i + ROM_BANK_SIZE] for i in range(ROM_BANK_START, self.header.rom_size, ROM_BANK_SIZE)]
-        self.ram_banks = [array("B", [0] * RAM_BANK_SIZE) for _ in range(self.header.ram_size // RAM_BANK_SIZE)]
-        self.ram_bank = 0
+    """A cartridge without a controller, and the base the mappers build on.
+
+    Bank switches happen in _switch, which recomputes the active bank views once
+    so reads never have to work out which bank they're in."""
+
+    # False when cart RAM can't be accessed as plain bytes and has to go through read and write
+    ram_buffered = True
+    # the bank selectors a save state has to keep, as attribute names and struct formats
+    STATE = (("rom_bank", "H"), ("ram_bank", "B"), ("ram_enabled", "?"))
+
+    def __init__(self, rom: array, header: HeaderData | None = None):
+        # every bank is a view over the one ROM buffer and the one RAM buffer, nothing is copied
+        self.rom = memoryview(rom).toreadonly()
+        self.header = header or get_header_data(self.rom)
+        rom_size = min(self.header.rom_size, len(self.rom))
+        self.rom_banks = [self.rom[i : i + ROM_BANK_SIZE] for i in range(0, rom_size, ROM_BANK_SIZE)]
+        self.rom_bank_0 = self.rom_banks[0]
         self.rom_bank = 1
-        self.ram_enabled = False
-        self.ram_mode = False
+        self.ram_bank = 0
+        self.ram_enabled = True
+        self.battery: BatteryRam | None = None
+        self._map_ram(bytearray(self._ram_size()))
+
+    def _ram_size(self) -> int:
+        return -(-self.header.ram_size // RAM_BANK_SIZE) * RAM_BANK_SIZE
+
+    def _map_ram(self, buffer):
+        self.ram = buffer
+        ram = memoryview(self.ram)
+        self.ram_banks = [ram[i : i + RAM_BANK_SIZE] for i in range(0, len(ram), RAM_BANK_SIZE)]
+        self._switch()
+
+    @property
+    def save_name(self) -> str:
+        return f"{self.header.title or 'Untitled'}-{self.header.global_checksum:04X}.sav"
+
+    def attach_battery(self, saves: Path):
+        """Back the cart RAM with its .sav file in saves, keeping whatever the file already holds."""
+        self.battery = BatteryRam(Path(saves) / self.save_name, len(self.ram))
+        self._map_ram(self.battery.buffer)
+
+    def close(self):
+        if self.battery is not None:
+            self.battery.close()
+
+    def _switch(self):
+        self.rom_bank %= len(self.rom_banks)
+        self.active_rom_bank = self.rom_banks[self.rom_bank]
+        if self.ram_enabled and self.ram_banks:
+            self.active_ram_bank = self.ram_banks[self.ram_bank % len(self.ram_banks)]
+        else:
+            self.active_ram_bank = None
+
+    def _control(self, address: int, value: int):
+        pass
+
+    @classmethod
+    def state_struct(cls) -> struct.Struct:
+        return struct.Struct("<" + "".join(format for _, format in cls.STATE))
+
+    def get_state(self) -> bytes:
+        return self.state_struct().pack(*(getattr(self, name) for name, _ in self.STATE))
 
+    def set_state(self, data):
+        for (name, _), value in zip(self.STATE, self.state_struct().unpack(data)):
+            if isinstance(value, bytes):
+                getattr(self, name)[:] = value
+            else:
+                setattr(self, name, value)
+        self._switch()
 
     def read(self, address: int) -> int:
         if ROM_BANK_START <= address < ROM_BANK_END:
-            return self.rom_banks_n[self.rom_bank][address - ROM_BANK_START]
+            return self.active_rom_bank[address - ROM_BANK_START]
         elif RAM_BANK_START <= address < RAM_BANK_END:
-            return self.ram_banks[self.ram_bank][address - RAM_BANK_START]
+            return (self.active_ram_bank or OPEN_BUS)[address - RAM_BANK_START]
         else:
             return self.rom_bank_0[address]
 
     def write(self, address: int, value: int):
         if RAM_BANK_START <= address < RAM_BANK_END:
-            self.ram_banks[self.ram_bank][address - RAM_BANK_START] = value
-        elif address == 0x0000:
-            self.ram_enabled = (value & 0x0F) == 0x0A
-        elif address == 0x2000:
-            self.rom_bank = value & 0x1F
-        elif address == 0x4000:
-            self.ram_bank = value & 0x03
-        elif address == 0x6000:
-            self.ram_mode = value & 0x01
\ No newline at end of file
+            if self.active_ram_bank is not None:
+                self.active_ram_bank[address - RAM_BANK_START] = value
+        elif address < ROM_BANK_END:
+            self._control(address, value)
+
+    def _region(self, address: int):
+        """The buffer behind address with the addresses it covers, or None for RAM only read a byte at a time."""
+        if address < ROM_BANK_START:
+            return self.rom_bank_0, 0x0000, ROM_BANK_START
+        elif address < ROM_BANK_END:
+            return self.active_rom_bank, ROM_BANK_START, ROM_BANK_END
+        elif RAM_BANK_START <= address < RAM_BANK_END:
+            return (self.active_ram_bank or OPEN_BUS) if self.ram_buffered else None, RAM_BANK_START, RAM_BANK_END
+        raise ValueError(f"Address {address:#06x} is not on the cartridge")
+
+    def read_block(self, address: int, n: int) -> memoryview:
+        """n bytes from address, a view of the bank when they're all in one, raising ValueError past the cart."""
+        out = bytearray(n)
+        position = 0
+        while position < n:
+            bank, start, end = self._region(address)
+            count = min(end - address, n - position)
+            if bank is None:
+                chunk = bytes(self.read(address + i) for i in range(count))
+            else:
+                chunk = memoryview(bank)[address - start : address - start + count]
+            if count == n:
+                return memoryview(chunk)
+            out[position : position + count] = chunk
+            position += count
+            address += count
+        return memoryview(out)
+
+    def write_block(self, address: int, data):
+        data = memoryview(data)
+        if self.ram_buffered and RAM_BANK_START <= address and address + len(data) <= RAM_BANK_END:
+            if self.active_ram_bank is not None:
+                self.active_ram_bank[address - RAM_BANK_START : address - RAM_BANK_START + len(data)] = data
+        else:
+            for offset, value in enumerate(data):
+                self.write(address + offset, value)
+
+
+class MBC1(Cart):
+    STATE = (("bank_low", "B"), ("bank_high", "B"), ("mode", "B"), ("ram_enabled", "?"))
+
+    def __init__(self, rom: array, header: HeaderData | None = None):
+        self.bank_low = 1
+        self.bank_high = 0
+        self.mode = 0
+        super().__init__(rom, header)
+        self.ram_enabled = False
+        self._switch()
+
+    def _control(self, address: int, value: int):
+        match address >> 13:
+            case 0:
+                self.ram_enabled = value & 0x0F == 0x0A
+            case 1:
+                self.bank_low = value & 0x1F or 1
+            case 2:
+                self.bank_high = value & 0x03
+            case 3:
+                self.mode = value & 0x01
+        self._switch()
+
+    def _switch(self):
+        self.rom_bank = self.bank_high << 5 | self.bank_low
+        # in mode 1 the upper bits also select the bank at 0x0000 and the RAM bank
+        self.rom_bank_0 = self.rom_banks[(self.bank_high << 5) % len(self.rom_banks) if self.mode else 0]
+        self.ram_bank = self.bank_high if self.mode else 0
+        super()._switch()
+
+
+class MBC2(Cart):
+    """512 half bytes of RAM built into the controller, repeated over 0xA000-0xBFFF."""
+
+    ram_buffered = False
+    STATE = (("rom_bank", "B"), ("ram_enabled", "?"))
+
+    def __init__(self, rom: array, header: HeaderData | None = None):
+        super().__init__(rom, header)
+        self.ram_enabled = False
+        self._switch()
+
+    def _ram_size(self) -> int:
+        return 0x200
+
+    def _control(self, address: int, value: int):
+        if address >= ROM_BANK_START:
+            return
+        # bit 8 of the address picks between the RAM enable and ROM bank registers
+        if address & 0x100:
+            self.rom_bank = value & 0x0F or 1
+        else:
+            self.ram_enabled = value & 0x0F == 0x0A
+        self._switch()
+
+    def read(self, address: int) -> int:
+        if RAM_BANK_START <= address < RAM_BANK_END:
+            return self.ram[address & 0x1FF] | 0xF0 if self.ram_enabled else 0xFF
+        return super().read(address)
+
+    def write(self, address: int, value: int):
+        if RAM_BANK_START <= address < RAM_BANK_END:
+            if self.ram_enabled:
+                self.ram[address & 0x1FF] = value & 0x0F
+        else:
+            super().write(address, value)
+
+
+class MBC3(Cart):
+    """Banks ROM and RAM, and maps the clock registers in place of RAM when banks 0x08-0x0C are selected.
+
+    The clock registers hold what was written to them but don't tick yet."""
+
+    STATE = Cart.STATE + (("latch", "B"), ("rtc", "5s"), ("latched_rtc", "5s"))
+
+    def __init__(self, rom: array, header: HeaderData | None = None):
+        self.rtc = bytearray(5)
+        self.latched_rtc = bytearray(5)
+        self.latch = 0xFF
+        super().__init__(rom, header)
+        self.ram_enabled = False
+        self._switch()
+
+    def _switch(self):
+        super()._switch()
+        self.ram_buffered = self.ram_bank < 0x08
+
+    def _control(self, address: int, value: int):
+        match address >> 13:
+            case 0:
+                self.ram_enabled = value & 0x0F == 0x0A
+            case 1:
+                self.rom_bank = value & 0x7F or 1
+            case 2:
+                self.ram_bank = value & 0x0F
+            case 3:
+                if self.latch == 0x00 and value == 0x01:
+                    self.latched_rtc[:] = self.rtc
+                self.latch = value
+        self._switch()
+
+    def read(self, address: int) -> int:
+        if RAM_BANK_START <= address < RAM_BANK_END and not self.ram_buffered:
+            if self.ram_enabled and self.ram_bank <= 0x0C:
+                return self.latched_rtc[self.ram_bank - 0x08]
+            return 0xFF
+        return super().read(address)
+
+    def write(self, address: int, value: int):
+        if RAM_BANK_START <= address < RAM_BANK_END and not self.ram_buffered:
+            if self.ram_enabled and self.ram_bank <= 0x0C:
+                self.rtc[self.ram_bank - 0x08] = value
+        else:
+            super().write(address, value)
+
+
+class MBC5(Cart):
+    STATE = (("rom_register", "H"), ("ram_bank", "B"), ("ram_enabled", "?"))
+
+    def __init__(self, rom: array, header: HeaderData | None = None):
+        self.rom_register = 1
+        super().__init__(rom, header)
+        self.ram_enabled = False
+        self._switch()
+
+    def _control(self, address: int, value: int):
+        match address >> 12:
+            case 0 | 1:
+                self.ram_enabled = value & 0x0F == 0x0A
+            case 2:
+                self.rom_register = self.rom_register & 0x100 | value
+            case 3:
+                self.rom_register = (value & 0x01) << 8 | self.rom_register & 0xFF
+            case 4 | 5:
+                self.ram_bank = value & 0x0F
+            case _:
+                return
+        self._switch()
+
+    def _switch(self):
+        self.rom_bank = self.rom_register
+        super()._switch()
+
+
+MAPPERS = MappingProxyType(
+    {
+        CartType.MBC1: MBC1,
+        CartType.MBC2: MBC2,
+        CartType.MBC3: MBC3,
+        CartType.MBC5: MBC5,
+    }
+)
+
+
+def load_cart(rom: array, saves: Path | str | None = None) -> Cart:
+    """Parse the header once and build the cart with the mapper for its controller.
+
+    Battery backed carts get their RAM from a .sav file in saves, when it's given."""
+    rom = memoryview(rom).toreadonly()
+    header = get_header_data(rom)
+    mapper = next((mapper for cart_type, mapper in MAPPERS.items() if cart_type in header.cartridge_type), Cart)
+    cart = mapper(rom, header)
+    if saves is not None and CartType.BATTERY in header.cartridge_type and cart.ram:
+        cart.attach_battery(saves)
+    return cart
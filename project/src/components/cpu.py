@@ -1,59 +1,571 @@
-from project.src.system import LogEvent, ComponentEvents, GuiEvents; LogEvent.LogInfo('Initializing CPU')
-from .instruction import Instruction, instructions, cb_instructions
+from project.src.system import LogEvent, ComponentEvents, GuiEvents, SystemEvents, get_value, cached, source_key; LogEvent.LogInfo('Initializing CPU')
+from array import array
 
-#Todo remove this temp event, is stand in for memory read
-ComponentEvents.RequestMemoryRead.allow_requests(lambda addr: 0)
+import numpy as np
+from project.src.system.system_paths import opcode_path
+from . import instruction as opcodes
+from .instruction import Instruction
+from .register import registry
+from . import alu
 
 
-_read_mem = ComponentEvents.RequestMemoryRead.request_data
-_write_mem = ComponentEvents.RequestMemoryWrite
-_read_reg = ComponentEvents.RequestRegisterRead.request_data
-_write_reg = ComponentEvents.RequestRegisterWrite
+_read_mem = ComponentEvents.RequestMemoryRead.bind(globals(), "_read_mem")
+_write_mem = ComponentEvents.RequestMemoryWrite.bind(globals(), "_write_mem")
+_rom_bank = ComponentEvents.RequestRomBank.bind(globals(), "_rom_bank")
+_watch_code = ComponentEvents.RequestWatchCode.bind(globals(), "_watch_code")
 
-def read_operand(operand) -> int:
-    match operand:
-        case 'A' | 'F' | 'B' | 'C' | 'D' | 'E' | 'H' | 'L':
-            return _read_reg(operand)
-        case 'AF' | 'BC' | 'DE' | 'HL' | 'SP' | 'PC':
-            return _read_reg(operand)
-        case 'd8' | 'a8':
-            return _read_mem(_read_reg('PC'))
-        case 'd16' | 'a16':
-            return _read_mem(_read_reg('PC')) | _read_mem(_read_reg('PC') + 1) << 8
-        case _ if operand.startswith('(') and operand.endswith(')'):
-            return _read_mem(read_operand(operand[1:-1]))
-        case _:
-            LogEvent.LogDebug(f'Unknown operand {operand} for read')
-            return 0
+_ADD, _SUB, _AND, _XOR, _OR, _INC, _DEC, _DAA = alu.ADD, alu.SUB, alu.AND, alu.XOR, alu.OR, alu.INC, alu.DEC, alu.DAA
+_RLC, _RRC, _RL, _RR, _SLA, _SRA, _SRL, _SWAP = alu.RLC, alu.RRC, alu.RL, alu.RR, alu.SLA, alu.SRA, alu.SRL, alu.SWAP
+_RLCA, _RRCA, _RLA, _RRA = alu.RLCA, alu.RRCA, alu.RLA, alu.RRA
+
+_8_BIT = ("A", "F", "B", "C", "D", "E", "H", "L")
+_16_BIT = ("AF", "BC", "DE", "HL", "SP", "PC")
+_CONDITIONS = {"NZ": "not r.F & 0x80", "Z": "r.F & 0x80", "NC": "not r.F & 0x10", "C": "r.F & 0x10"}
+
+
+class CPUState:
+    __slots__ = ("ime", "halted", "cycles")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ime = False
+        self.halted = False
+        self.cycles = 0
+
+
+state = CPUState()
 
-def write_operand(operand, value):
-    match operand:
-        case _ if operand.startswith('(') and operand.endswith(')'):
-            _write_mem(read_operand(operand[1:-1]), value)
-        case _:
-            LogEvent.LogDebug(f'Unknown operand {operand} for write')
 
 def fetch_op_code():
-    val = _read_mem(_read_reg('PC'))
-    _write_reg('PC', _read_reg('PC') + 1)
-    return val
+    pc = registry.PC
+    registry.PC = pc + 1 & 0xFFFF
+    return _read_mem(pc)
+
+
+def _fetch_16():
+    return fetch_op_code() | fetch_op_code() << 8
+
+
+def _push(value):
+    sp = registry.SP - 2 & 0xFFFF
+    registry.SP = sp
+    _write_mem(sp, value & 0xFF)
+    _write_mem(sp + 1 & 0xFFFF, value >> 8)
+
+
+def _pop():
+    sp = registry.SP
+    registry.SP = sp + 2 & 0xFFFF
+    return _read_mem(sp) | _read_mem(sp + 1 & 0xFFFF) << 8
+
 
 def decode_op_code(op_code, is_cb=False):
     if is_cb:
-        return cb_instructions[op_code]
-    return instructions[op_code]
+        return opcodes.cb_instructions[op_code]
+    return opcodes.instructions[op_code]
 
-@ComponentEvents.RequestExecute
-def execute(instruction: Instruction):
-    match instruction.mnemonic:
-        case "NOP":
-            pass
-        case "PREFIX":
-            execute(decode_op_code(fetch_op_code(), is_cb=True))
-        case "HALT":
-            ComponentEvents.RequestHalt()
 
+# Every instruction is turned into lines of Python source that run with the registers as `r`,
+# its immediate operand already read into `d8` or `d16`, and PC already past the instruction.
+# Returns are written as "return {elapsed}<cycles>" so a block of instructions can add the
+# cycles spent before it.
+
+def _address(operand: str) -> tuple[list[str], str]:
+    match operand:
+        case "(HL+)" | "(HL-)":
+            step = "+" if operand[3] == "+" else "-"
+            return ["hl = r.HL", f"r.HL = hl {step} 1 & 0xFFFF"], "hl"
+        case "(C)":
+            return [], "0xFF00 | r.C"
+        case "(a8)":
+            return [], "0xFF00 | d8"
+        case "(a16)":
+            return [], "d16"
         case _:
-            LogEvent.LogDebug(f"Instruction {instruction.mnemonic} not implemented yet.")
+            return [], f"r.{operand[1:-1]}"
+
+
+def _read(operand: str) -> tuple[list[str], str]:
+    if operand in _8_BIT or operand in _16_BIT:
+        return [], f"r.{operand}"
+    if operand in ("d8", "d16"):
+        return [], operand
+    setup, address = _address(operand)
+    return setup, f"_read_mem({address})"
+
+
+def _write(operand: str, value: str) -> list[str]:
+    if operand in _8_BIT or operand in _16_BIT:
+        return [f"r.{operand} = {value}"]
+    setup, address = _address(operand)
+    return setup + [f"_write_mem({address}, {value})"]
+
+
+def _modify(operand: str, expression: str) -> list[str]:
+    """Read an operand into `value`, then write back `expression` of it, touching (HL) once."""
+    if operand == "(HL)":
+        return ["hl = r.HL", "value = _read_mem(hl)", f"_write_mem(hl, {expression})"]
+    return [f"value = r.{operand}", f"r.{operand} = {expression}"]
+
+
+def _accumulate(table: str, operand: str, carry: str = "0", store: bool = True) -> list[str]:
+    setup, value = _read(operand)
+    lines = setup + [f"entry = {table}[{carry} << 16 | r.A << 8 | {value}]"]
+    if store:
+        lines.append("r.A = entry & 0xFF")
+    return lines + ["r.F = entry >> 8"]
+
+
+def _table_modify(table: str, operand: str) -> list[str]:
+    return _modify(operand, f"(entry := {table}[(r.F & 0x10) << 4 | value]) & 0xFF") + ["r.F = entry >> 8"]
+
+
+def _branch(condition: str | None, taken: list[str], cycles: list[int]) -> list[str]:
+    if condition is None:
+        return taken + [f"return {{elapsed}}{cycles[0]}"]
+    return (
+        [f"if {_CONDITIONS[condition]}:"]
+        + [f"    {line}" for line in taken]
+        + [f"    return {{elapsed}}{cycles[0]}", f"return {{elapsed}}{cycles[1]}"]
+    )
+
+
+def _body(instruction: Instruction) -> list[str]:
+    """The source lines of an instruction, ending in a return of its cycles."""
+    mnemonic, op1, op2 = instruction.mnemonic, instruction.operand1, instruction.operand2
+    cycles = instruction.cycles
+    match mnemonic:
+        case "NOP":
+            lines = []
+        case "HALT" | "STOP":
+            lines = ["ComponentEvents.RequestHalt()"]
+        case "DI" | "EI":
+            lines = [f"state.ime = {mnemonic == 'EI'}"]
+        case "LD" if op1 == "(a16)" and op2 == "SP":
+            lines = ["_write_mem(d16, r.SP & 0xFF)", "_write_mem(d16 + 1 & 0xFFFF, r.SP >> 8)"]
+        case "LD" if op2 == "SP+r8":
+            lines = [
+                "sp, offset = r.SP, d8",
+                "r.F = _ADD[(sp & 0xFF) << 8 | offset] >> 8 & 0x30",
+                "r.HL = sp + (offset ^ 0x80) - 0x80 & 0xFFFF",
+            ]
+        case "LD" | "LDH":
+            setup, value = _read(op2)
+            lines = setup + _write(op1, value)
+        case "ADD" if op1 == "A":
+            lines = _accumulate("_ADD", op2)
+        case "ADD" if op1 == "HL":
+            lines = [
+                f"hl, value = r.HL, r.{op2}",
+                "r.F = r.F & 0x80 | ((hl & 0xFFF) + (value & 0xFFF) > 0xFFF) << 5 | (hl + value > 0xFFFF) << 4",
+                "r.HL = hl + value & 0xFFFF",
+            ]
+        case "ADD":
+            lines = [
+                "sp, offset = r.SP, d8",
+                "r.F = _ADD[(sp & 0xFF) << 8 | offset] >> 8 & 0x30",
+                "r.SP = sp + (offset ^ 0x80) - 0x80 & 0xFFFF",
+            ]
+        case "ADC":
+            lines = _accumulate("_ADD", op2, "(r.F & 0x10) >> 4")
+        case "SUB":
+            lines = _accumulate("_SUB", op1)
+        case "SBC":
+            lines = _accumulate("_SUB", op2, "(r.F & 0x10) >> 4")
+        case "CP":
+            lines = _accumulate("_SUB", op1, store=False)
+        case "AND" | "XOR" | "OR":
+            lines = _accumulate(f"_{mnemonic}", op1)
+        case "INC" | "DEC" if op1 in _16_BIT:
+            step = "+" if mnemonic == "INC" else "-"
+            lines = [f"r.{op1} = r.{op1} {step} 1 & 0xFFFF"]
+        case "INC" | "DEC" | "RLC" | "RRC" | "RL" | "RR" | "SLA" | "SRA" | "SRL" | "SWAP":
+            lines = _table_modify(f"_{mnemonic}", op1)
+        case "RLCA" | "RRCA" | "RLA" | "RRA":
+            lines = _table_modify(f"_{mnemonic}", "A")
+        case "DAA":
+            lines = ["entry = _DAA[(r.F & 0x70) << 4 | r.A]", "r.A = entry & 0xFF", "r.F = entry >> 8"]
+        case "CPL":
+            lines = ["r.A ^= 0xFF", "r.F |= 0x60"]
+        case "SCF":
+            lines = ["r.F = r.F & 0x80 | 0x10"]
+        case "CCF":
+            lines = ["r.F = (r.F & 0x90) ^ 0x10"]
+        case "BIT":
+            setup, value = _read(op2)
+            lines = setup + [f"r.F = r.F & 0x10 | 0x20 | (not {value} & {1 << int(op1)}) << 7"]
+        case "RES":
+            lines = _modify(op2, f"value & {0xFF ^ 1 << int(op1)}")
+        case "SET":
+            lines = _modify(op2, f"value | {1 << int(op1)}")
+        case "PUSH":
+            lines = [f"_push(r.{op1})"]
+        case "POP":
+            lines = [f"r.{op1} = _pop(){' & 0xFFF0' if op1 == 'AF' else ''}"]
+        case "JP" if op1 == "(HL)":
+            return ["r.PC = r.HL", f"return {{elapsed}}{cycles[0]}"]
+        case "JP":
+            condition = op1 if op2 else None
+            return _branch(condition, ["r.PC = d16"], cycles)
+        case "JR":
+            condition = op1 if op2 else None
+            return _branch(condition, ["r.PC = r.PC + (d8 ^ 0x80) - 0x80 & 0xFFFF"], cycles)
+        case "CALL":
+            condition = op1 if op2 else None
+            return _branch(condition, ["_push(r.PC)", "r.PC = d16"], cycles)
+        case "RET" | "RETI":
+            taken = ["r.PC = _pop()"] + (["state.ime = True"] if mnemonic == "RETI" else [])
+            return _branch(op1, taken, cycles)
+        case "RST":
+            return _branch(None, ["_push(r.PC)", f"r.PC = 0x{op1[:2]}"], cycles)
+        case _:
+            return [
+                f"LogEvent.LogDebug('Instruction %s not implemented yet.', {mnemonic!r})",
+                f"return {{elapsed}}{cycles[0]}",
+            ]
+    return lines + [f"return {{elapsed}}{cycles[0]}"]
+
+
+def _immediate(instruction: Instruction) -> str | None:
+    operands = (instruction.operand1, instruction.operand2)
+    if any(operand in ("d16", "a16", "(a16)") for operand in operands):
+        return "d16"
+    if any(operand in ("d8", "a8", "(a8)", "r8", "SP+r8") for operand in operands):
+        return "d8"
+    return None
+
+
+def _compile_handler(name: str, instruction: Instruction):
+    lines = ["r = registry"]
+    match _immediate(instruction):
+        case "d16":
+            lines.append("d16 = _fetch_16()")
+        case "d8":
+            lines.append("d8 = fetch_op_code()")
+    lines += [line.format(elapsed="") for line in _body(instruction)]
+    source = f"def {name}():\n" + "".join(f"    {line}\n" for line in lines)
+    return compile(source, f"<{instruction}>", "exec")
+
+
+def _define(name: str, code):
+    namespace = {}
+    exec(code, globals(), namespace)
+    return namespace[name]
+
+
+def _prefix():
+    return cb_handlers[fetch_op_code()]()
+
+
+def _unimplemented(op_code: int, index: int):
+    def handler():
+        fallback_counts[index] += 1
+        LogEvent.LogDebug("Instruction %s not implemented yet.", hex(op_code))
+        return 4
+
+    return handler
+
+
+def _compile_handlers() -> dict:
+    return {
+        f"{prefix}_{op_code:02X}": _compile_handler(f"{prefix}_{op_code:02X}", instruction)
+        for prefix, table in (("op", opcodes.instructions), ("cb", opcodes.cb_instructions))
+        for op_code, instruction in table.items()
+    }
+
+
+# the handlers' code only changes with the opcode table or the code generating it, so it's compiled
+# once and loaded from the cache after that, without touching the opcode table at all
+_handler_code = cached("handlers", source_key(opcode_path, opcodes.__file__, __file__), _compile_handlers)
+
+
+def _load_handlers(prefix: str, base: int) -> list:
+    return [
+        _define(name, _handler_code[name]) if (name := f"{prefix}_{op_code:02X}") in _handler_code else _unimplemented(op_code, base | op_code)
+        for op_code in range(0x100)
+    ]
+
+
+# Execution counters, indexed by opcode with the CB table at 0x100 onwards. Fallbacks are always
+# counted; opcodes and PCs only while counting is on, as it takes the slower counting step.
+opcode_counts = array("Q", bytes(8 * 0x200))
+fallback_counts = array("Q", bytes(8 * 0x200))
+pc_counts = array("Q", bytes(8 * 0x10000))
+banked_pc_counts: dict = {}  # switchable ROM bank -> counts for 0x4000-0x7FFF
+counting_enabled = False
+
+handlers = _load_handlers("op", 0x000)
+cb_handlers = _load_handlers("cb", 0x100)
+handlers[0xCB] = _prefix
+
+
+
+def step() -> int:
+    if state.halted:
+        cycles = 4
+    else:
+        cycles = handlers[fetch_op_code()]()
+    state.cycles += cycles
+    return cycles
+
+
+# Basic block translation: the straight-line run of instructions starting at a PC is compiled into
+# one function with its immediates inlined and the cycles summed, cached by ROM bank and address.
+# Blocks in RAM watch their pages and are dropped when memory there is written. A block also ends
+# after anything that writes memory, as the write can switch the ROM bank or overwrite the block.
+
+_BLOCK_LIMIT = 64
+_BLOCK_ENDS = {"JP", "JR", "CALL", "RET", "RETI", "RST", "HALT", "STOP", "EI", "DI"}
+
+blocks: dict = {}
+_page_blocks: dict = {}
+block_cache_enabled = False
+
+
+def _interpret():
+    return handlers[fetch_op_code()]()
+
+
+def _size(op_code: int, instruction: Instruction) -> int:
+    """The bytes the interpreter fetches for an instruction, so blocks move PC on exactly as far."""
+    return (2 if op_code == 0xCB else 1) + {"d16": 2, "d8": 1}.get(_immediate(instruction), 0)
+
+
+def _writes_memory(body: list[str]) -> bool:
+    return any("_write_mem(" in line or "_push(" in line for line in body)
+
+
+def _translatable(pc: int) -> bool:
+    return pc < 0x8000 or 0xC000 <= pc < 0xE000 or 0xFF80 <= pc < 0xFFFF
+
+
+def _translate(start: int, key: int):
+    lines = ["r = registry"]
+    pc, elapsed = start, 0
+    for count in range(1, _BLOCK_LIMIT + 1):
+        op_code = _read_mem(pc)
+        if op_code == 0xCB:
+            instruction = opcodes.cb_instructions[_read_mem(pc + 1 & 0xFFFF)]
+        elif op_code in opcodes.instructions:
+            instruction = opcodes.instructions[op_code]
+        else:
+            break
+        match _immediate(instruction):
+            case "d16":
+                lines.append(f"d16 = {_read_mem(pc + 1 & 0xFFFF) | _read_mem(pc + 2 & 0xFFFF) << 8}")
+            case "d8":
+                lines.append(f"d8 = {_read_mem(pc + 1 & 0xFFFF)}")
+        pc = pc + _size(op_code, instruction) & 0xFFFF
+        body = _body(instruction)
+        if instruction.mnemonic in _BLOCK_ENDS or _writes_memory(body):
+            lines.append(f"r.PC = {pc}")
+            lines += [line.format(elapsed=f"{elapsed} + ") for line in body]
+            break
+        lines += body[:-1]
+        elapsed += instruction.cycles[0]
+        if count == _BLOCK_LIMIT or (pc ^ start) & 0xC000 or not _translatable(pc):
+            lines += [f"r.PC = {pc}", f"return {elapsed}"]
+            break
+    else:
+        lines += [f"r.PC = {pc}", f"return {elapsed}"]
+    if pc == start:
+        return _interpret
+    source = "def block():\n" + "".join(f"    {line}\n" for line in lines)
+    namespace = {}
+    exec(compile(source, f"<block {key:06X}>", "exec"), globals(), namespace)
+    if start >= 0x8000:
+        for page in range(start >> 8, ((pc - 1 & 0xFFFF) >> 8) + 1):
+            _page_blocks.setdefault(page, set()).add(key)
+            _watch_code(page, True)
+    return namespace["block"]
+
+
+def step_block() -> int:
+    if state.halted:
+        cycles = 4
+    else:
+        pc = registry.PC
+        key = _rom_bank() << 16 | pc if 0x4000 <= pc < 0x8000 else pc
+        block = blocks.get(key)
+        if block is None:
+            block = blocks[key] = _translate(pc, key) if _translatable(pc) else _interpret
+        cycles = block()
+    state.cycles += cycles
+    return cycles
+
+
+def _count_banked_pc(pc: int):
+    bank = _rom_bank()
+    if (counts := banked_pc_counts.get(bank)) is None:
+        counts = banked_pc_counts[bank] = array("Q", bytes(8 * 0x4000))
+    counts[pc - 0x4000] += 1
+
+
+def step_counting() -> int:
+    if state.halted:
+        cycles = 4
+    else:
+        pc = registry.PC
+        if pc & 0xC000 == 0x4000:
+            _count_banked_pc(pc)
+        else:
+            pc_counts[pc] += 1
+        op_code = fetch_op_code()
+        if op_code == 0xCB:
+            opcode_counts[0x100 | _read_mem(registry.PC)] += 1
+        else:
+            opcode_counts[op_code] += 1
+        cycles = handlers[op_code]()
+    state.cycles += cycles
+    return cycles
+
+
+def run(cycles: int) -> int:
+    """Run for at least the given number of cycles, returning how many were actually run."""
+    step_function = step_counting if counting_enabled else step_block if block_cache_enabled else step
+    start = state.cycles
+    target = start + cycles
+    while state.cycles < target:
+        step_function()
+    return state.cycles - start
+
+
+def set_block_cache(enabled: bool):
+    global block_cache_enabled
+    block_cache_enabled = enabled
+    clear_blocks()
+
+
+@ComponentEvents.CodeModified
+def invalidate_blocks(address: int):
+    page = address >> 8
+    for key in _page_blocks.pop(page, ()):
+        blocks.pop(key, None)
+    _watch_code(page, False)
+
+
+@ComponentEvents.RomLoaded
+def clear_blocks(*_):
+    for page in _page_blocks:
+        _watch_code(page, False)
+    _page_blocks.clear()
+    blocks.clear()
+
+
+SystemEvents.SettingsUpdated(lambda: set_block_cache(get_value("developer", "block cache")))
+block_cache_enabled = get_value("developer", "block cache")
+
+
+def set_counting(enabled: bool):
+    global counting_enabled
+    counting_enabled = enabled
+
+
+SystemEvents.SettingsUpdated(lambda: set_counting(get_value("developer", "count instructions")))
+counting_enabled = get_value("developer", "count instructions")
+
+
+@ComponentEvents.RomLoaded
+def reset_counts(*_):
+    for counts in (opcode_counts, fallback_counts, pc_counts):
+        memoryview(counts).cast("B")[:] = bytes(len(counts) * 8)
+    banked_pc_counts.clear()
+
+
+@ComponentEvents.RequestExecutionCounts.allow_requests
+def execution_counts() -> dict:
+    """The live counter arrays; opcodes and fallbacks by opcode with the CB table from 0x100."""
+    return {"opcodes": opcode_counts, "fallbacks": fallback_counts, "pcs": pc_counts, "banked pcs": banked_pc_counts}
+
+
+def _opcode_name(index: int) -> str:
+    table = opcodes.cb_instructions if index & 0x100 else opcodes.instructions
+    instruction = table.get(index & 0xFF)
+    return f"{'CB ' if index & 0x100 else ''}{index & 0xFF:02X} {instruction or '(not implemented)'}"
+
+
+def _top(counts: array, limit: int) -> list[tuple[int, int]]:
+    """The indices and values of the largest nonzero counts, largest first and then by index."""
+    values = np.frombuffer(counts, np.uint64)
+    indices = np.flatnonzero(values)
+    if len(indices) > limit > 0:
+        threshold = np.partition(values[indices], -limit)[-limit]
+        indices = indices[values[indices] >= threshold]
+    indices = indices[np.lexsort((indices, -values[indices].astype(np.int64)))][:limit]
+    return [(int(index), int(values[index])) for index in indices]
+
+
+def hot_opcodes(limit: int = 10, counts: array = opcode_counts) -> list[tuple[str, int]]:
+    return [(_opcode_name(index), count) for index, count in _top(counts, limit)]
+
+
+def hot_addresses(limit: int = 10) -> list[tuple[str, int]]:
+    hot = [(count, f"{pc:04X}") for pc, count in _top(pc_counts, limit)]
+    for bank, counts in banked_pc_counts.items():
+        hot += [(count, f"{bank:02X}:{pc + 0x4000:04X}") for pc, count in _top(counts, limit)]
+    hot.sort(key=lambda item: item[0], reverse=True)
+    return [(address, count) for count, address in hot[:limit]]
+
+
+@GuiEvents.RequestHotspotStatus.allow_requests
+def format_hotspots(limit: int = 10) -> str:
+    # the GUI asks every second, so the counters are only searched while they're being filled
+    if counting_enabled:
+        lines = [f"{count:>12} {name}" for name, count in hot_opcodes(limit)]
+        lines.append("")
+        lines += [f"{count:>12} {address}" for address, count in hot_addresses(limit)]
+    else:
+        lines = ["Instruction counting is disabled"]
+    if fallbacks := hot_opcodes(limit, fallback_counts):
+        lines += ["", "Not implemented:"] + [f"{count:>12} {name}" for name, count in fallbacks]
+    return "\n".join(lines)
+
+
+def _table_index(instruction: Instruction) -> int:
+    """Where an instruction is in the handler tables, with the CB table from 0x100, by what it decodes to."""
+    op_code = int(instruction.op_code, 16)
+    for base, table in ((0x000, opcodes.instructions), (0x100, opcodes.cb_instructions)):
+        entry = table.get(op_code)
+        if entry is not None and (entry.mnemonic, entry.operand1, entry.operand2) == (
+            instruction.mnemonic,
+            instruction.operand1,
+            instruction.operand2,
+        ):
+            return base | op_code
+    raise ValueError(f"{instruction} is not in the opcode tables")
+
+
+@ComponentEvents.RequestExecute
+def execute(instruction: Instruction) -> int:
+    index = _table_index(instruction)
+    if counting_enabled:
+        opcode_counts[index] += 1
+    return (cb_handlers if index & 0x100 else handlers)[index & 0xFF]()
+
+
+@ComponentEvents.RequestHalt
+def halt():
+    state.halted = True
+
+
+@ComponentEvents.RequestUnhalt
+def unhalt():
+    state.halted = False
+
+
+@ComponentEvents.RequestInterruptEnable
+def enable_interrupts():
+    state.ime = True
+
+
+@ComponentEvents.RequestInterruptDisable
+def disable_interrupts():
+    state.ime = False
 
 
+@ComponentEvents.RequestReset
+def reset():
+    state.reset()
+    clear_blocks()
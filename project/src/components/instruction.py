@@ -6,7 +6,7 @@ from typing import NamedTuple
 from functools import partial
 
 from project.src.system import bus
-from project.src.system import ComponentEvents, LogEvent
+from project.src.system import ComponentEvents, LogEvent, cached, source_key
 from project.src.system.system_paths import opcode_path
 
 
@@ -30,31 +30,42 @@ class Instruction(
 
     @classmethod
     def load(cls, file_path: Path) -> dict:
-        try: json_data = json.loads(gzip.decompress(file_path.read_bytes()).decode())
-        except FileNotFoundError: raise FileNotFoundError(f"Could not find {file_path} in current directory.")
+        if not file_path.exists(): raise FileNotFoundError(f"Could not find {file_path} in current directory.")
+        table = cached("opcodes", source_key(file_path, __file__), partial(_read_table, file_path))
         return {
-            category: {
-                int(op_code, 16): cls(
-                    op_code,
-                    op_code_settings["mnemonic"],
-                    op_code_settings.get("length"),
-                    op_code_settings.get("cycles"),
-                    op_code_settings.get("flags"),
-                    op_code_settings.get("addr"),
-                    op_code_settings.get("group"),
-                    op_code_settings.get("operand1", None),
-                    op_code_settings.get("operand2", None),
-                )
-                for op_code, op_code_settings in operation.items()
-            }
-            for category, operation in json_data.items()
+            category: {op_code: cls(*fields) for op_code, fields in operation.items()}
+            for category, operation in table.items()
         }
 
     def __str__(self) -> str:
         return f"{self.mnemonic}({self.operand1}, {self.operand2})"
 
-instructions, cb_instructions = Instruction.load(opcode_path).values()
-
 
+def _read_table(file_path: Path) -> dict:
+    json_data = json.loads(gzip.decompress(file_path.read_bytes()).decode())
+    return {
+        category: {
+            int(op_code, 16): (
+                op_code,
+                op_code_settings["mnemonic"],
+                op_code_settings.get("length"),
+                op_code_settings.get("cycles"),
+                op_code_settings.get("flags"),
+                op_code_settings.get("addr"),
+                op_code_settings.get("group"),
+                op_code_settings.get("operand1", None),
+                op_code_settings.get("operand2", None),
+            )
+            for op_code, op_code_settings in operation.items()
+        }
+        for category, operation in json_data.items()
+    }
 
 
+def __getattr__(name: str):
+    # the tables are only built the first time something asks for them
+    global instructions, cb_instructions
+    if name in ("instructions", "cb_instructions"):
+        instructions, cb_instructions = Instruction.load(opcode_path).values()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
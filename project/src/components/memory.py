@@ -1,5 +1,8 @@
 from array import array
-from .cartridge import Cart
+from .cartridge import Cart, load_cart
+from project.src.system import ComponentEvents, SystemEvents, get_value
+
+PAGE_SIZE = 0x100
 
 class Memory:
     data: array
@@ -17,57 +20,292 @@ class Memory:
             raise Exception("Memory is read only")
         self.data[address - self.start_offset] = value
 
+    def read_block(self, address: int, n: int) -> memoryview:
+        offset = address - self.start_offset
+        return memoryview(self.data)[offset : offset + n]
+
+    def write_block(self, address: int, data):
+        if self.read_only:
+            raise Exception("Memory is read only")
+        offset = address - self.start_offset
+        memoryview(self.data)[offset : offset + len(data)] = memoryview(data)
+
+    def pages(self) -> list[memoryview]:
+        view = memoryview(self.data)
+        return [view[i : i + PAGE_SIZE] for i in range(0, len(view), PAGE_SIZE)]
+
+
+class MappedPage:
+    """A page whose accesses are forwarded to handlers, for MMIO and anything not backed by a single buffer."""
+
+    __slots__ = ("base", "reader", "writer")
+
+    def __init__(self, base: int, reader=None, writer=None):
+        self.base = base
+        self.reader = reader
+        self.writer = writer
+
+    def __getitem__(self, offset: int) -> int:
+        return self.reader(self.base | offset)
+
+    def __setitem__(self, offset: int, value: int):
+        self.writer(self.base | offset, value)
+
+
+ROM_BANK_0_OFFSET = 0x0000
+ROM_BANK_N_OFFSET = 0x4000
 V_RAM_SIZE = 0x2000
-V_RAM_OFFSET = 0x2000
-H_RAM_SIZE = 0x80
-H_RAM_OFFSET = 0x8000
+V_RAM_OFFSET = 0x8000
+TILE_DATA_SIZE = 0x1800
+TILE_SIZE = 0x10
+CART_RAM_OFFSET = 0xA000
+W_RAM_SIZE = 0x2000
+W_RAM_OFFSET = 0xC000
+ECHO_RAM_OFFSET = 0xE000
+ECHO_RAM_SIZE = 0x1E00
 OAM_SIZE = 0xA0
 OAM_OFFSET = 0xFE00
 IO_SIZE = 0x80
 IO_OFFSET = 0xFF00
+LCD_OFFSET = 0xFF40
+LCD_END = 0xFF4C
 Z_RAM_SIZE = 0x7F
 Z_RAM_OFFSET = 0xFF80
+IE_SIZE = 0x01
+IE_OFFSET = 0xFFFF
 
 
 v_ram: Memory = Memory(V_RAM_SIZE, V_RAM_OFFSET)
-h_ram: Memory = Memory(H_RAM_SIZE, H_RAM_OFFSET)
+w_ram: Memory = Memory(W_RAM_SIZE, W_RAM_OFFSET)
 oam: Memory = Memory(OAM_SIZE, OAM_OFFSET)
 io: Memory = Memory(IO_SIZE, IO_OFFSET)
 z_ram:Memory = Memory(Z_RAM_SIZE, Z_RAM_OFFSET)
+ie: Memory = Memory(IE_SIZE, IE_OFFSET)
 cart: Cart | None = None
 
-def read(address: int) -> int:
-    if address < V_RAM_OFFSET:
-        if cart:
-            return cart.read(address)
-        return 0
-    elif address < H_RAM_OFFSET:
-        return v_ram.read(address)
-    elif address < OAM_OFFSET:
-        return h_ram.read(address)
-    elif address < IO_OFFSET:
-        return oam.read(address)
-    elif address < Z_RAM_OFFSET:
-        return io.read(address)
+# One entry per high address byte, each a page sized buffer indexed by the low byte or a MappedPage.
+read_pages: list = [None] * 0x100
+write_pages: list = [None] * 0x100
+_unwatched_write_pages: list = write_pages.copy()
+watched_pages = bytearray(0x100)
+
+_empty_page = memoryview(bytes(PAGE_SIZE))
+_open_bus_page = memoryview(bytes([0xFF] * PAGE_SIZE))
+_ignored_page = MappedPage(0, writer=lambda *_: None)
+_bank_page_cache: dict = {}
+_mapped_banks = None
+
+# one flag per tile in VRAM, set when any of its bytes is written so only those get decoded again
+tile_dirty = bytearray([1]) * (TILE_DATA_SIZE // TILE_SIZE)
+
+_video_read = ComponentEvents.RequestVideoRead.bind(globals(), "_video_read")
+_video_write = ComponentEvents.RequestVideoWrite.bind(globals(), "_video_write")
+
+
+def _read_oam(address: int) -> int:
+    if address < OAM_OFFSET + OAM_SIZE:
+        return oam.data[address - OAM_OFFSET]
+    return 0
+
+def _write_oam(address: int, value: int):
+    if address < OAM_OFFSET + OAM_SIZE:
+        oam.data[address - OAM_OFFSET] = value
+
+def _write_tile_data(address: int, value: int):
+    v_ram.data[address - V_RAM_OFFSET] = value
+    tile_dirty[address - V_RAM_OFFSET >> 4] = 1
+
+def mark_tiles_dirty():
+    """Flag every tile, for when VRAM is replaced behind the page table's back."""
+    tile_dirty[:] = bytes([1]) * len(tile_dirty)
+
+def _read_high(address: int) -> int:
+    if address < Z_RAM_OFFSET:
+        if LCD_OFFSET <= address < LCD_END:
+            return _video_read(address)
+        return io.data[address - IO_OFFSET]
+    elif address < IE_OFFSET:
+        return z_ram.data[address - Z_RAM_OFFSET]
+    return ie.data[0]
+
+def _write_high(address: int, value: int):
+    if address < Z_RAM_OFFSET:
+        if LCD_OFFSET <= address < LCD_END:
+            _video_write(address, value)
+        else:
+            io.data[address - IO_OFFSET] = value
+    elif address < IE_OFFSET:
+        z_ram.data[address - Z_RAM_OFFSET] = value
     else:
-        return z_ram.read(address)
+        ie.data[0] = value
 
-def write(address: int, value: int):
-    if address < V_RAM_OFFSET:
-        if cart:
-            cart.write(address, value)
-    elif address < H_RAM_OFFSET:
-        v_ram.write(address, value)
-    elif address < OAM_OFFSET:
-        h_ram.write(address, value)
-    elif address < IO_OFFSET:
-        oam.write(address, value)
-    elif address < Z_RAM_OFFSET:
-        io.write(address, value)
+def _write_cart(address: int, value: int):
+    if cart:
+        cart.write(address, value)
+        _map_banks()
+
+def _code_modified(address: int, end: int):
+    """Report a write to [address, end) of a watched page, by its WRAM address if it came through echo RAM."""
+    if address >= IO_OFFSET:
+        # code only runs from HRAM on the high page, so IO and IE writes leave its blocks alone
+        address = max(address, Z_RAM_OFFSET)
+        if address >= min(end, IE_OFFSET):
+            return
+    elif address >= ECHO_RAM_OFFSET:
+        address -= ECHO_RAM_OFFSET - W_RAM_OFFSET
+    ComponentEvents.CodeModified(address)
+
+def _write_watched(address: int, value: int):
+    _unwatched_write_pages[address >> 8][address & 0xFF] = value
+    _code_modified(address, address + 1)
+
+def _set_pages(first_page: int, read: list, write: list | None = None):
+    read_pages[first_page : first_page + len(read)] = read
+    if write is not None:
+        _unwatched_write_pages[first_page : first_page + len(write)] = write
+        for page in range(first_page, first_page + len(write)):
+            if not watched_pages[page]:
+                write_pages[page] = write[page - first_page]
+
+def _bank_pages(bank) -> list:
+    view = memoryview(bank)
+    return [view[i : i + PAGE_SIZE] for i in range(0, len(view), PAGE_SIZE)]
+
+def _view_pages(bank) -> list:
+    if (pages := _bank_page_cache.get(id(bank))) is None:
+        pages = _bank_page_cache[id(bank)] = _bank_pages(bank)
+    return pages
+
+def _map_banks():
+    """Point the banked ROM and RAM pages at the cart's active banks, touching only the ones that changed."""
+    global _mapped_banks
+    rom_bank_0, rom_bank, ram_bank = cart.rom_bank_0, cart.active_rom_bank, cart.active_ram_bank
+    ram = (ram_bank, cart.ram_buffered)
+    if _mapped_banks is None:
+        _mapped_banks = (None, None, None)
+    mapped_rom_bank_0, mapped_rom_bank, mapped_ram = _mapped_banks
+    _mapped_banks = (rom_bank_0, rom_bank, ram)
+    if rom_bank is not mapped_rom_bank:
+        _set_pages(ROM_BANK_N_OFFSET >> 8, _view_pages(rom_bank))
+    if rom_bank_0 is not mapped_rom_bank_0:
+        _set_pages(ROM_BANK_0_OFFSET >> 8, _view_pages(rom_bank_0))
+    if mapped_ram is not None and ram[0] is mapped_ram[0] and ram[1] == mapped_ram[1]:
+        return
+    if not cart.ram_buffered:
+        _set_pages(CART_RAM_OFFSET >> 8, *[[MappedPage(page << 8, cart.read, cart.write) for page in range(0xA0, 0xC0)]] * 2)
+    elif ram_bank is None:
+        _set_pages(CART_RAM_OFFSET >> 8, [_open_bus_page] * 0x20, [_ignored_page] * 0x20)
     else:
-        z_ram.write(address, value)
+        ram_pages = _view_pages(ram_bank)
+        _set_pages(CART_RAM_OFFSET >> 8, ram_pages, ram_pages)
+
+def _map_cart():
+    global _mapped_banks
+    _mapped_banks = None
+    cart_writes = [MappedPage(page << 8, writer=_write_cart) for page in range(0x80)]
+    if cart is None:
+        _set_pages(ROM_BANK_0_OFFSET >> 8, [_empty_page] * 0x80, cart_writes)
+        _set_pages(CART_RAM_OFFSET >> 8, [_empty_page] * 0x20, [_ignored_page] * 0x20)
+        return
+    _bank_page_cache.clear()
+    _set_pages(ROM_BANK_0_OFFSET >> 8, [_empty_page] * 0x80, cart_writes)
+    _map_banks()
+
+def _map_memory():
+    _map_cart()
+    tile_data_pages = [MappedPage(page << 8, writer=_write_tile_data) for page in range(0x80, 0x98)]
+    _set_pages(V_RAM_OFFSET >> 8, v_ram.pages(), tile_data_pages + v_ram.pages()[len(tile_data_pages) :])
+    w_ram_pages = w_ram.pages()
+    _set_pages(W_RAM_OFFSET >> 8, w_ram_pages, w_ram_pages)
+    _set_pages(ECHO_RAM_OFFSET >> 8, w_ram_pages[:0x1E], w_ram_pages[:0x1E])
+    oam_page = MappedPage(OAM_OFFSET, _read_oam, _write_oam)
+    _set_pages(OAM_OFFSET >> 8, [oam_page], [oam_page])
+    high_page = MappedPage(IO_OFFSET, _read_high, _write_high)
+    _set_pages(IO_OFFSET >> 8, [high_page], [high_page])
 
-def load_cartridge(array: array):
+_map_memory()
+
+@ComponentEvents.RequestMemoryRead.allow_requests
+def read(address: int) -> int:
+    return read_pages[address >> 8][address & 0xFF]
+
+@ComponentEvents.RequestMemoryWrite.allow_requests
+@ComponentEvents.RequestMemoryWrite
+def write(address: int, value: int):
+    write_pages[address >> 8][address & 0xFF] = value
+
+@ComponentEvents.RequestMemoryReadBlock.allow_requests
+def read_block(address: int, n: int) -> memoryview:
+    """Copy n bytes starting at address out of the map, a page sized slice at a time."""
+    out = bytearray(n)
+    position = 0
+    while position < n:
+        offset = address & 0xFF
+        count = min(PAGE_SIZE - offset, n - position)
+        page = read_pages[address >> 8]
+        if type(page) is memoryview:
+            out[position : position + count] = page[offset : offset + count]
+        else:
+            out[position : position + count] = bytes(page[i] for i in range(offset, offset + count))
+        position += count
+        address = address + count & 0xFFFF
+    return memoryview(out)
+
+@ComponentEvents.RequestMemoryWriteBlock.allow_requests
+@ComponentEvents.RequestMemoryWriteBlock
+def write_block(address: int, data):
+    data = memoryview(data)
+    position = 0
+    while position < len(data):
+        offset = address & 0xFF
+        count = min(PAGE_SIZE - offset, len(data) - position)
+        page = _unwatched_write_pages[address >> 8]
+        if type(page) is memoryview:
+            page[offset : offset + count] = data[position : position + count]
+        elif page.writer is _write_tile_data:
+            start = address - V_RAM_OFFSET
+            memoryview(v_ram.data)[start : start + count] = data[position : position + count]
+            first, last = start >> 4, start + count - 1 >> 4
+            tile_dirty[first : last + 1] = bytes([1]) * (last - first + 1)
+        else:
+            for i in range(count):
+                page[offset + i] = data[position + i]
+        if watched_pages[address >> 8]:
+            _code_modified(address, address + count)
+        position += count
+        address = address + count & 0xFFFF
+
+@ComponentEvents.RequestWatchCode.allow_requests
+def watch_code(page: int, watch: bool):
+    pages = [page]
+    # WRAM code can be overwritten through its echo as well
+    if W_RAM_OFFSET <= page << 8 < W_RAM_OFFSET + ECHO_RAM_SIZE:
+        pages.append(page + (ECHO_RAM_OFFSET - W_RAM_OFFSET >> 8))
+    for page in pages:
+        watched_pages[page] = watch
+        write_pages[page] = MappedPage(page << 8, writer=_write_watched) if watch else _unwatched_write_pages[page]
+
+@ComponentEvents.RequestRomBank.allow_requests
+def rom_bank() -> int:
+    return cart.rom_bank if cart else 1
+
+@ComponentEvents.RomLoaded
+def load_cartridge(array: array, saves: str | None = None):
+    """Map a new cartridge in, with battery RAM kept in saves, or the configured saves path by default."""
     global cart
-    cart = Cart(array)
+    unload_cartridge()
+    # a new cartridge is a power cycle, so runs of the same ROM start from the same memory
+    for region in (v_ram, w_ram, oam, io, z_ram, ie):
+        memoryview(region.data)[:] = bytes(len(region.data))
+    mark_tiles_dirty()
+    cart = load_cart(array, saves if saves is not None else get_value("paths", "saves"))
+    _map_cart()
 
+@ComponentEvents.RomUnloaded
+@SystemEvents.Quit
+def unload_cartridge():
+    global cart
+    if cart is not None:
+        cart.close()
+        cart = None
+        _map_cart()
@@ -0,0 +1,340 @@
+import numpy as np
+
+from project.src.system import ComponentEvents, LogEvent; LogEvent.LogInfo('Initializing PPU')
+from . import memory
+
+WIDTH, HEIGHT = 160, 144
+LINES = 154
+CYCLES_PER_LINE = 456
+CYCLES_PER_FRAME = LINES * CYCLES_PER_LINE
+# a visible line is spent searching OAM, then drawing, then in HBlank
+OAM_CYCLES = 80
+DRAW_CYCLES = 172
+HBLANK_CYCLES = CYCLES_PER_LINE - OAM_CYCLES - DRAW_CYCLES
+
+LCDC, STAT, SCY, SCX, LY, LYC, DMA, BGP, OBP0, OBP1, WY, WX = range(0xFF40, 0xFF4C)
+IF = 0xFF0F
+HBLANK, VBLANK, OAM_SEARCH, DRAWING = range(4)
+
+# shades from 0 (white) to 3 (black), one byte per pixel
+framebuffer = np.zeros((HEIGHT, WIDTH), np.uint8)
+
+_io = memory.io.data
+_vram = np.frombuffer(memory.v_ram.data, np.uint8)
+_oam = np.frombuffer(memory.oam.data, np.uint8).reshape(40, 4)
+_x = np.arange(WIDTH)
+_sprite_x = np.array([np.arange(8), np.arange(8)[::-1]]) - 8
+_lines = np.arange(HEIGHT)[:, None]
+# the cache entry a tile map index points at, counting from 0x8000 or signed from 0x9000
+_tile_numbers = np.array([np.arange(0x100), (np.arange(0x100) + 0x80) % 0x100 + 0x80])
+# the four shades a palette register maps colours 0-3 to, for every value of the register
+_shades = np.array([[palette >> 2 * colour & 3 for colour in range(4)] for palette in range(0x100)], np.uint8)
+
+
+class PPUState:
+    __slots__ = ("mode", "remaining", "window_line")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.mode = OAM_SEARCH
+        self.remaining = OAM_CYCLES
+        self.window_line = 0
+
+
+state = PPUState()
+
+
+def _get(register: int) -> int:
+    return _io[register - memory.IO_OFFSET]
+
+
+def _set(register: int, value: int):
+    _io[register - memory.IO_OFFSET] = value
+
+
+def _interrupt(bit: int):
+    _set(IF, _get(IF) | bit)
+
+
+def _set_mode(mode: int):
+    state.mode = mode
+    stat = _get(STAT) & 0xFC | mode
+    _set(STAT, stat)
+    # HBlank, VBlank and OAM each have an enable bit for the STAT interrupt, starting at bit 3
+    if mode != DRAWING and stat & 0x08 << mode:
+        _interrupt(0x02)
+
+
+def _set_ly(ly: int):
+    _set(LY, ly)
+    _compare_ly()
+
+
+def _compare_ly():
+    if _get(LY) == _get(LYC):
+        _set(STAT, _get(STAT) | 0x04)
+        if _get(STAT) & 0x40:
+            _interrupt(0x02)
+    else:
+        _set(STAT, _get(STAT) & ~0x04)
+
+
+class TileCache:
+    """Every tile in VRAM decoded to 8x8 colour indices. Writes to tile data flag the tile in
+    memory.tile_dirty, and only flagged tiles are decoded again before the next line is drawn.
+
+    Each tile row a line reads is a lookup, and a miss if its tile had to be decoded for that line."""
+
+    __slots__ = ("tiles", "lookups", "misses", "decoded", "_fresh")
+
+    TILES = memory.TILE_DATA_SIZE // memory.TILE_SIZE
+    _planes = _vram[: memory.TILE_DATA_SIZE].reshape(TILES, 8, 2)
+    _dirty = np.frombuffer(memory.tile_dirty, np.uint8)
+
+    def __init__(self):
+        self.tiles = np.zeros((self.TILES, 8, 8), np.uint8)
+        self._fresh = None
+        self.reset_stats()
+
+    def refresh(self):
+        self._fresh = None
+        if 1 not in memory.tile_dirty:
+            return
+        dirty = np.flatnonzero(self._dirty)
+        memory.tile_dirty[:] = bytes(len(memory.tile_dirty))
+        # each row's low plane unpacks to the first 8 bits and its high plane to the last 8, leftmost pixel first
+        bits = np.unpackbits(self._planes[dirty], axis=2)
+        self.tiles[dirty] = bits[..., :8] | bits[..., 8:] << 1
+        self.decoded += len(dirty)
+        self._fresh = dirty
+
+    def lookup(self, numbers: np.ndarray, rows) -> np.ndarray:
+        """The given rows of the tiles in numbers, counted as lookups, and as misses where the tile was just decoded."""
+        self.lookups += len(numbers)
+        if self._fresh is not None:
+            self.misses += int(np.isin(numbers, self._fresh).sum())
+        return self.tiles[numbers, rows]
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of tile row lookups that found their tile already decoded."""
+        return 1 - self.misses / self.lookups if self.lookups else 0.0
+
+    def reset_stats(self):
+        self.lookups = 0
+        self.misses = 0
+        self.decoded = 0
+
+
+tile_cache = TileCache()
+
+
+def _map_row(lcdc: int, map_select: int, y: int) -> np.ndarray:
+    """The 256 colour indices of line y of a tile map."""
+    start = (0x1C00 if lcdc & map_select else 0x1800) + (y >> 3) * 32
+    return tile_cache.lookup(_tile_numbers[0 if lcdc & 0x10 else 1][_vram[start : start + 32]], y & 7).ravel()
+
+
+class _Sprites:
+    """Where every sprite is drawn on every line, worked out once a frame as OAM is normally only
+    changed in VBlank. Sprites are ordered bottom first, so later writes win where they overlap."""
+
+    __slots__ = ("height", "lines", "visible", "tiles", "rows", "xs", "on_screen", "behind", "palettes")
+
+    def __init__(self, height: int):
+        y, x, tiles, flags = _oam.T.astype(np.intp)
+        rows = _lines + 16 - y
+        visible = (rows >= 0) & (rows < height)
+        # only the first ten sprites in OAM are drawn on a line
+        visible &= visible.cumsum(axis=1) <= 10
+        rows = np.where(flags & 0x40, height - 1 - rows, rows)
+        # the lower half of a tall sprite is the next tile
+        tiles = (tiles & 0xFE if height == 16 else tiles) + (rows >> 3)
+        # the sprite with the lowest X is on top, then the one earliest in OAM
+        order = np.argsort(x << 6 | np.arange(len(x)))[::-1]
+        # flipping a sprite horizontally is drawing its pixels right to left
+        xs = (x[:, None] + _sprite_x[flags >> 5 & 1])[order]
+        self.height = height
+        self.visible = visible[:, order]
+        self.lines = self.visible.any(axis=1).tolist()
+        self.tiles = tiles[:, order]
+        self.rows = (rows & 7)[:, order]
+        self.on_screen = (xs >= 0) & (xs < WIDTH)
+        self.xs = np.where(self.on_screen, xs, 0)
+        self.behind = (flags[order] & 0x80 != 0)[:, None]
+        self.palettes = flags[order] >> 4 & 1
+
+
+_sprites = None
+
+
+def invalidate():
+    """Drop the sprite table, for when OAM is replaced rather than written a byte at a time."""
+    global _sprites
+    _sprites = None
+
+
+def _draw_sprites(ly: int, lcdc: int, colours: np.ndarray, line: np.ndarray):
+    global _sprites
+    height = 16 if lcdc & 0x04 else 8
+    if ly == 0 or _sprites is None or _sprites.height != height:
+        _sprites = _Sprites(height)
+    sprites = _sprites
+    if not sprites.lines[ly]:
+        return
+    visible = np.flatnonzero(sprites.visible[ly])
+    pixels = tile_cache.lookup(sprites.tiles[ly, visible], sprites.rows[ly, visible])
+    xs = sprites.xs[visible]
+    # sprites behind the background only show over its colour 0
+    shown = (pixels != 0) & sprites.on_screen[visible] & ~(sprites.behind[visible] & (colours[xs] != 0))
+    palettes = np.array((_get(OBP0), _get(OBP1)))[sprites.palettes[visible]]
+    line[xs[shown]] = (palettes[:, None] >> pixels * 2 & 3)[shown]
+
+
+def render_line(ly: int):
+    """Draw line ly of the framebuffer from the current VRAM, OAM and registers."""
+    lcdc = _get(LCDC)
+    line = framebuffer[ly]
+    tile_cache.refresh()
+    if lcdc & 0x01:
+        scy, scx = _get(SCY), _get(SCX)
+        colours = _map_row(lcdc, 0x08, scy + ly & 0xFF)[scx + _x & 0xFF]
+        wx = _get(WX)
+        if lcdc & 0x20 and _get(WY) <= ly and wx < WIDTH + 7:
+            start, skip = max(wx - 7, 0), max(7 - wx, 0)
+            colours[start:] = _map_row(lcdc, 0x40, state.window_line & 0xFF)[skip : skip + WIDTH - start]
+            state.window_line += 1
+        line[:] = _shades[_get(BGP)][colours]
+    else:
+        colours = np.zeros(WIDTH, np.uint8)
+        line[:] = 0
+    if lcdc & 0x02:
+        _draw_sprites(ly, lcdc, colours, line)
+
+
+def _next_mode() -> bool:
+    if not _get(LCDC) & 0x80:
+        # with the LCD off nothing is drawn, but frames still take as long
+        state.remaining += CYCLES_PER_FRAME
+        return True
+    if state.mode == OAM_SEARCH:
+        _set_mode(DRAWING)
+        state.remaining += DRAW_CYCLES
+    elif state.mode == DRAWING:
+        render_line(_get(LY))
+        _set_mode(HBLANK)
+        state.remaining += HBLANK_CYCLES
+    else:
+        ly = _get(LY) + 1
+        if ly == LINES:
+            _set_ly(0)
+            state.window_line = 0
+            _set_mode(OAM_SEARCH)
+            state.remaining += OAM_CYCLES
+            return True
+        _set_ly(ly)
+        if ly < HEIGHT:
+            _set_mode(OAM_SEARCH)
+            state.remaining += OAM_CYCLES
+        else:
+            if ly == HEIGHT:
+                _set_mode(VBLANK)
+                _interrupt(0x01)
+            state.remaining += CYCLES_PER_LINE
+    return False
+
+
+def advance(cycles: int) -> bool:
+    """Move the PPU on by the cycles the CPU just ran, returning whether that finished a frame."""
+    state.remaining -= cycles
+    finished = False
+    while state.remaining <= 0:
+        finished |= _next_mode()
+    return finished
+
+
+@ComponentEvents.RequestTileCacheStats.allow_requests
+def tile_cache_stats() -> dict:
+    return {
+        "lookups": tile_cache.lookups,
+        "misses": tile_cache.misses,
+        "decoded": tile_cache.decoded,
+        "hit_rate": tile_cache.hit_rate,
+    }
+
+
+@ComponentEvents.RequestVideoRead.allow_requests
+def read(address: int) -> int:
+    if address == STAT:
+        return _get(STAT) | 0x80
+    return _get(address)
+
+
+@ComponentEvents.RequestVideoWrite.allow_requests
+def write(address: int, value: int):
+    if address == LCDC:
+        was_on = _get(LCDC) & 0x80
+        _set(LCDC, value)
+        if was_on and not value & 0x80:
+            _set_ly(0)
+            _set_mode(HBLANK)
+            state.remaining = CYCLES_PER_FRAME
+            framebuffer[:] = 0
+        elif value & 0x80 and not was_on:
+            state.reset()
+            _set_ly(0)
+            _set_mode(OAM_SEARCH)
+    elif address == STAT:
+        # only the interrupt enables are writable
+        _set(STAT, _get(STAT) & 0x07 | value & 0x78)
+    elif address == LYC:
+        _set(LYC, value)
+        _compare_ly()
+    elif address == DMA:
+        _set(DMA, value)
+        memoryview(memory.oam.data)[:] = memory.read_block(value << 8, memory.OAM_SIZE)
+        invalidate()
+    elif address != LY:
+        _set(address, value)
+
+
+def boot():
+    """Set the video registers to what the DMG boot ROM leaves them as."""
+    for register, value in ((LCDC, 0x91), (STAT, 0x85), (SCY, 0), (SCX, 0), (LYC, 0), (BGP, 0xFC), (WY, 0), (WX, 0)):
+        _set(register, value)
+    reset()
+
+
+@ComponentEvents.RequestReset
+def reset():
+    state.reset()
+    framebuffer[:] = 0
+    tile_cache.reset_stats()
+    _set_ly(0)
+    if _get(LCDC) & 0x80:
+        _set_mode(OAM_SEARCH)
+    else:
+        _set_mode(HBLANK)
+        state.remaining = CYCLES_PER_FRAME
+
+
+__all__ = [
+    "WIDTH",
+    "HEIGHT",
+    "CYCLES_PER_LINE",
+    "CYCLES_PER_FRAME",
+    "framebuffer",
+    "TileCache",
+    "tile_cache",
+    "tile_cache_stats",
+    "state",
+    "invalidate",
+    "render_line",
+    "advance",
+    "read",
+    "write",
+    "boot",
+    "reset",
+]
@@ -1,74 +1,130 @@
-import array
-from functools import partial
 from project.src.system import ComponentEvents, LogEvent, GuiEvents
 
-registry = array.array("B", [0] * 16)
 
-_set_8 = lambda i, v: registry.__setitem__(i, v & 0xFF)
-_set_16 = lambda i, v: registry.__setitem__(
-    slice(i, i + 2), array.array("B", [v >> 8, v & 0xFF])
-)
-_get_8 = lambda i: registry[i]
-_get_16 = lambda i: int.from_bytes(registry[slice(i, i + 2)], byteorder="big")
+class RegisterFile:
+    """The CPU registers as plain ints, with the 16-bit pairs and flag bits as properties."""
 
+    __slots__ = ("A", "F", "B", "C", "D", "E", "H", "L", "SP", "PC")
 
-_make_regs = lambda regs: {
-    c: (
-        partial(_set_16 if len(c) == 2 else _set_8, i),
-        partial(_get_16 if len(c) == 2 else _get_8, i),
-    )
-    for i, c in enumerate(regs)
-}
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.A = self.F = self.B = self.C = self.D = self.E = self.H = self.L = 0
+        self.SP = self.PC = 0
+
+    def boot(self):
+        """Set the registers to what the DMG boot ROM leaves them as when it jumps to the cartridge."""
+        self.AF, self.BC, self.DE, self.HL = 0x01B0, 0x0013, 0x00D8, 0x014D
+        self.SP, self.PC = 0xFFFE, 0x0100
+
+    @property
+    def AF(self) -> int:
+        return self.A << 8 | self.F
+
+    @AF.setter
+    def AF(self, value: int):
+        self.A = value >> 8 & 0xFF
+        self.F = value & 0xFF
+
+    @property
+    def BC(self) -> int:
+        return self.B << 8 | self.C
+
+    @BC.setter
+    def BC(self, value: int):
+        self.B = value >> 8 & 0xFF
+        self.C = value & 0xFF
+
+    @property
+    def DE(self) -> int:
+        return self.D << 8 | self.E
+
+    @DE.setter
+    def DE(self, value: int):
+        self.D = value >> 8 & 0xFF
+        self.E = value & 0xFF
+
+    @property
+    def HL(self) -> int:
+        return self.H << 8 | self.L
+
+    @HL.setter
+    def HL(self, value: int):
+        self.H = value >> 8 & 0xFF
+        self.L = value & 0xFF
 
-_8_bit_regs = _make_regs(["A", "F", "B", "C", "D", "E", "H", "L"])
-_18_bit_regs = _make_regs(["AF", "BC", "DE", "HL"])
+    @property
+    def FZ(self) -> int:
+        return self.F >> 7 & 1
+
+    @FZ.setter
+    def FZ(self, value: int):
+        self.F = self.F & 0x7F | (value & 1) << 7
+
+    @property
+    def FN(self) -> int:
+        return self.F >> 6 & 1
+
+    @FN.setter
+    def FN(self, value: int):
+        self.F = self.F & 0xBF | (value & 1) << 6
+
+    @property
+    def FH(self) -> int:
+        return self.F >> 5 & 1
+
+    @FH.setter
+    def FH(self, value: int):
+        self.F = self.F & 0xDF | (value & 1) << 5
+
+    @property
+    def FC(self) -> int:
+        return self.F >> 4 & 1
+
+    @FC.setter
+    def FC(self, value: int):
+        self.F = self.F & 0xEF | (value & 1) << 4
+
+
+registry = RegisterFile()
+
+_8_BIT = frozenset(["A", "F", "B", "C", "D", "E", "H", "L"])
+_masks = {
+    **dict.fromkeys(_8_BIT, 0xFF),
+    **dict.fromkeys(["AF", "BC", "DE", "HL", "SP", "PC"], 0xFFFF),
+    **dict.fromkeys(["FZ", "FN", "FH", "FC"], 0x01),
+}
 
 
+@ComponentEvents.RequestRegisterWrite.allow_requests
 @ComponentEvents.RequestRegisterWrite
 def set_register(register, value):
-    LogEvent.LogDebug(f"Writing {value} to {register}")
-    match register:
-        case "A" | "F" | "B" | "C" | "D" | "E" | "H" | "L":
-            _8_bit_regs[register][0](value)
-        case "AF" | "BC" | "DE" | "HL":
-            _18_bit_regs[register][0](value)
-        case "SP":
-            _set_16(8, value)
-        case "PC":
-            _set_16(10, value)
-        case "FZ" | "FN" | "FH" | "FC":
-            _set_8(1, _get_8(1) & ~(1 << "ZNC".index(register[1])) | (value << "ZNC".index(register[1])))
-        case _:
-            raise KeyError(f"Unknown register for given key {register}")
+    # the 8-bit registers are most of the traffic, so they go straight to their slot without the debug log
+    if register in _8_BIT:
+        setattr(registry, register, value & 0xFF)
+        return
+    LogEvent.LogDebug("Writing %s to %s", value, register)
+    if register not in _masks:
+        raise KeyError(f"Unknown register for given key {register}")
+    setattr(registry, register, value & _masks[register])
 
 
 @ComponentEvents.RequestRegisterRead.allow_requests
 def get_register(register):
-    LogEvent.LogDebug(f"Reading {register}")
-    match register:
-        case "A" | "F" | "B" | "C" | "D" | "E" | "H" | "L":
-            return _8_bit_regs[register][1]()
-        case "AF" | "BC" | "DE" | "HL":
-            return _18_bit_regs[register][1]()
-        case "SP":
-            return _get_16(8)
-        case "PC":
-            return _get_16(10)
-        case "FZ", "FN", "FH", "FC":
-            return _get_8(1) >> "ZNC".index(register[1]) & 1
+    if register in _8_BIT:
+        return getattr(registry, register)
+    LogEvent.LogDebug("Reading %s", register)
+    if register not in _masks:
+        raise KeyError(f"Unknown register for given key {register}")
+    return getattr(registry, register)
 
 
 @GuiEvents.RequestRegistryStatus.allow_requests
 def get_registry_status():
-    return_string = ""
-    for i, reg in enumerate(["AF", "BC", "DE", "HL", "SP", "PC"]):
-        left, right = registry[i * 2], registry[i * 2 + 1]
-        return_string += f"{reg}: {left:02X}{right:02X} "
-    return_string = return_string[:-1]
-    return return_string
+    return " ".join(f"{reg}: {getattr(registry, reg):04X}" for reg in ["AF", "BC", "DE", "HL", "SP", "PC"])
 
 
 @ComponentEvents.RequestReset
 def reset():
-    for i in range(12):
-        registry[i] = 0
+    registry.reset()
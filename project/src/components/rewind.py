@@ -0,0 +1,103 @@
+import zlib
+from collections import deque
+
+from project.src.system import ComponentEvents, SystemEvents, LogEvent, get_value
+from . import save_state
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+class RewindBuffer:
+    """Snapshots kept as zlib compressed XOR deltas, dropping the oldest once over the byte budget.
+
+    Only the latest snapshot is kept whole, and each delta turns a snapshot back into the one
+    before it, so stepping back is one XOR and the oldest delta can go without touching the rest."""
+
+    def __init__(self, budget: int, interval: int = 1, level: int = 1):
+        self.budget = budget
+        self.interval = max(interval, 1)
+        self.level = level
+        self.deltas: deque[bytes] = deque()
+        self.size = 0
+        self.latest: bytes | None = None
+        self.frames = 0
+
+    def __len__(self) -> int:
+        return len(self.deltas) + (self.latest is not None)
+
+    def clear(self):
+        self.deltas.clear()
+        self.size = 0
+        self.latest = None
+        self.frames = 0
+
+    def push(self, snapshot: bytes):
+        if self.latest is not None and len(self.latest) != len(snapshot):
+            self.clear()
+        if self.latest is not None:
+            delta = zlib.compress(_xor(snapshot, self.latest), self.level)
+            self.deltas.append(delta)
+            self.size += len(delta)
+            while self.size > self.budget and self.deltas:
+                self.size -= len(self.deltas.popleft())
+        self.latest = snapshot
+
+    def pop(self) -> bytes | None:
+        """Step back one snapshot and return it, staying on the oldest once there's nothing older."""
+        if self.deltas:
+            delta = self.deltas.pop()
+            self.size -= len(delta)
+            self.latest = _xor(self.latest, zlib.decompress(delta))
+        return self.latest
+
+    def frame(self, capture=save_state.capture):
+        self.frames += 1
+        if self.frames % self.interval == 0:
+            self.push(capture())
+
+
+buffer = RewindBuffer(0)
+enabled = False
+
+
+def configure():
+    global enabled
+    enabled = get_value("rewind", "enabled")
+    buffer.budget = get_value("rewind", "memory budget mb") << 20
+    buffer.interval = max(get_value("rewind", "interval frames"), 1)
+    if not enabled:
+        buffer.clear()
+
+
+configure()
+SystemEvents.SettingsUpdated(configure)
+
+
+@ComponentEvents.FrameCompleted
+def record_frame():
+    if enabled:
+        buffer.frame()
+
+
+@ComponentEvents.RequestRewind
+def rewind(steps: int = 1) -> bool:
+    """Restore the state from the given number of snapshots back, returning False when there is none."""
+    state = None
+    for _ in range(steps):
+        state = buffer.pop()
+    if state is None:
+        return False
+    save_state.restore(state)
+    LogEvent.LogDebug("Rewound %s snapshots, %s left", steps, len(buffer))
+    return True
+
+
+@ComponentEvents.RomLoaded
+@ComponentEvents.RomUnloaded
+def clear(*_):
+    buffer.clear()
+
+
+__all__ = ["RewindBuffer", "buffer", "configure", "record_frame", "rewind", "clear"]
@@ -0,0 +1,104 @@
+import struct
+from pathlib import Path
+
+from project.src.system import ComponentEvents, LogEvent, get_value
+from . import memory, ppu
+from .cpu import state as cpu_state
+from .register import registry
+
+# A state is the header, the registers, CPU counters and PPU timing, every memory region as it is
+# laid out in its buffer, then the cart's bank selectors and its RAM. Everything is copied in and out in bulk,
+# and restoring writes into the buffers that are already there.
+MAGIC = b"GBST"
+FORMAT_VERSION = 2
+# version 1 had no PPU timing, which can't be worked out from the registers mid line
+OLDEST_VERSION = 2
+
+_header = struct.Struct("<4sHHHI")  # magic, version, cart checksum, cart state size, cart RAM size
+_registers = struct.Struct("<8B2H")
+_registers_fields = ("A", "F", "B", "C", "D", "E", "H", "L", "SP", "PC")
+_cpu = struct.Struct("<??Q")
+_ppu = struct.Struct("<BiH")  # mode, cycles left in it, window line
+_regions = (memory.v_ram, memory.w_ram, memory.oam, memory.io, memory.z_ram, memory.ie)
+
+
+def _cart_header():
+    cart = memory.cart
+    if cart is None:
+        return 0, b"", b""
+    return cart.header.global_checksum, cart.get_state(), cart.ram
+
+
+def capture() -> bytes:
+    checksum, cart_state, cart_ram = _cart_header()
+    return b"".join(
+        [
+            _header.pack(MAGIC, FORMAT_VERSION, checksum, len(cart_state), len(cart_ram)),
+            _registers.pack(*(getattr(registry, field) for field in _registers_fields)),
+            _cpu.pack(cpu_state.ime, cpu_state.halted, cpu_state.cycles),
+            _ppu.pack(ppu.state.mode, ppu.state.remaining, ppu.state.window_line),
+            *(region.data for region in _regions),
+            cart_state,
+            cart_ram,
+        ]
+    )
+
+
+def restore(data):
+    data = memoryview(data)
+    magic, version, checksum, cart_state_size, cart_ram_size = _header.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a save state")
+    if version < OLDEST_VERSION:
+        raise ValueError(f"Save state version {version} has no PPU state and can't be restored, save it again")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Save state version {version} is not supported, expected {FORMAT_VERSION}")
+    expected_checksum, cart_state, cart_ram = _cart_header()
+    if (checksum, cart_state_size, cart_ram_size) != (expected_checksum, len(cart_state), len(cart_ram)):
+        raise ValueError("Save state was taken with a different cartridge")
+
+    position = _header.size
+    for field, value in zip(_registers_fields, _registers.unpack_from(data, position)):
+        setattr(registry, field, value)
+    position += _registers.size
+    cpu_state.ime, cpu_state.halted, cpu_state.cycles = _cpu.unpack_from(data, position)
+    position += _cpu.size
+    ppu.state.mode, ppu.state.remaining, ppu.state.window_line = _ppu.unpack_from(data, position)
+    position += _ppu.size
+    for region in _regions:
+        size = len(region.data)
+        memoryview(region.data)[:] = data[position : position + size]
+        position += size
+    memory.mark_tiles_dirty()
+    ppu.invalidate()
+    if memory.cart is not None:
+        memory.cart.set_state(data[position : position + cart_state_size])
+        position += cart_state_size
+        memoryview(memory.cart.ram)[:] = data[position : position + cart_ram_size]
+        memory._map_banks()
+    # translated blocks over RAM that was just overwritten are stale
+    for page, watched in enumerate(memory.watched_pages):
+        if watched:
+            ComponentEvents.CodeModified(page << 8)
+
+
+def state_path(slot: int) -> Path:
+    name = memory.cart.save_name if memory.cart is not None else "Untitled.sav"
+    return Path(get_value("paths", "save states")) / f"{Path(name).stem}.{slot}.state"
+
+
+@ComponentEvents.RequestSaveState
+def save_state(slot: int = 0):
+    path = state_path(slot)
+    path.write_bytes(capture())
+    LogEvent.LogInfo("Saved state to %s", path)
+
+
+@ComponentEvents.RequestLoadState
+def load_state(slot: int = 0):
+    path = state_path(slot)
+    restore(path.read_bytes())
+    LogEvent.LogInfo("Loaded state from %s", path)
+
+
+__all__ = ["MAGIC", "FORMAT_VERSION", "capture", "restore", "state_path", "save_state", "load_state"]
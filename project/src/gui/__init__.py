@@ -11,6 +11,7 @@ class MainWindow(tkinter.Tk):
 
     registry_view: DataView
     memory_view: DataView
+    bus_view: DataView
 
     cartridge_data_tab: CartridgeDataWidget
 
@@ -32,6 +33,10 @@ class MainWindow(tkinter.Tk):
         ComponentEvents.RomLoaded(self.switch_to_screen)
         ComponentEvents.RequestReset(self.switch_to_library)
 
+        GuiEvents.Update.set_queued()
+        ComponentEvents.HeaderLoaded.set_queued()
+        self.process_events()
+
     def make_bottom_bar(self):
         self.bottom_bar = Notebook(self, height=150)
         self.bottom_bar.pack(side=tkinter.BOTTOM, fill=tkinter.X)
@@ -39,10 +44,14 @@ class MainWindow(tkinter.Tk):
         self.cartridge_data_tab = CartridgeDataWidget(self.bottom_bar)
         self.registry_view = DataView(self.bottom_bar, GuiEvents.RequestRegistryStatus)
         self.memory_view = DataView(self.bottom_bar, GuiEvents.RequestMemoryStatus)
+        self.bus_view = DataView(self.bottom_bar, GuiEvents.RequestBusStatus)
+        self.hotspot_view = DataView(self.bottom_bar, GuiEvents.RequestHotspotStatus)
 
         self.bottom_bar.add(self.cartridge_data_tab, text="Cartridge Data")
         self.bottom_bar.add(self.registry_view, text="Registry")
         self.bottom_bar.add(self.memory_view, text="Memory")
+        self.bottom_bar.add(self.bus_view, text="Bus")
+        self.bottom_bar.add(self.hotspot_view, text="Hotspots")
         self.bottom_bar_collapse_button = tkinter.Button(self, text="▼", command=self.collapse_bottom_bar)
         self.bottom_bar_collapse_button.pack(side=tkinter.BOTTOM, fill=tkinter.X)
         self.toggle_bottom_bar()
@@ -98,6 +107,10 @@ class MainWindow(tkinter.Tk):
         self.update_loop()
         self.mainloop()
 
+    def process_events(self):
+        self.after(16, self.process_events)
+        dd.drain()
+
     def update_loop(self):
         self.after(1000, self.update_loop)
         GuiEvents.Update()
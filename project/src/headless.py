@@ -0,0 +1,79 @@
+import hashlib
+from pathlib import Path
+from time import perf_counter
+
+from project.src.system import ComponentEvents, SystemEvents, LogEvent
+from project.src.components import cpu, memory, ppu, register
+from project.src.structs.rom_data import load_rom_data
+
+# 154 lines of 456 cycles each
+CYCLES_PER_FRAME = ppu.CYCLES_PER_FRAME
+
+
+def run_frame() -> int:
+    # the CPU runs up to the next PPU mode change each time, so the PPU sees every line's registers
+    start = cpu.state.cycles
+    while not ppu.advance(cpu.run(ppu.state.remaining)):
+        pass
+    ComponentEvents.FrameCompleted()
+    return cpu.state.cycles - start
+
+
+def load(rom: Path | str):
+    load_rom_data(rom)
+    ComponentEvents.RequestReset()
+    register.registry.boot()
+    ppu.boot()
+
+
+def run(rom: Path | str, frames: int | None = None) -> int:
+    """Run the ROM without the GUI for the given number of frames, or until interrupted, returning the frames run."""
+    load(rom)
+    LogEvent.LogInfo("Running %s headless", rom)
+    frame = 0
+    try:
+        while frames is None or frame < frames:
+            run_frame()
+            frame += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        SystemEvents.Quit()
+    return frame
+
+
+def _digest(*buffers) -> str:
+    digest = hashlib.sha256()
+    for buffer in buffers:
+        digest.update(buffer)
+    return digest.hexdigest()
+
+
+def run_rom(rom: Path | str, frames: int) -> dict:
+    """Run the ROM uncapped for the given number of frames and report the throughput and final state."""
+    load(rom)
+    start_cycles = cpu.state.cycles
+    start = perf_counter()
+    for _ in range(frames):
+        run_frame()
+    elapsed = perf_counter() - start
+    cycles = cpu.state.cycles - start_cycles
+    report = {
+        "rom": str(rom),
+        "title": memory.cart.header.title,
+        "frames": frames,
+        "cycles": cycles,
+        "seconds": elapsed,
+        "cycles_per_second": cycles / elapsed if elapsed else 0.0,
+        "frames_per_second": frames / elapsed if elapsed else 0.0,
+        "registers": {name: getattr(register.registry, name) for name in ("AF", "BC", "DE", "HL", "SP", "PC")},
+        "vram_hash": _digest(memory.v_ram.data, memory.oam.data),
+        "framebuffer_hash": _digest(ppu.framebuffer),
+        "tile_cache_hit_rate": ppu.tile_cache.hit_rate,
+        "ram_hash": _digest(memory.w_ram.data, memory.z_ram.data, memory.cart.ram),
+    }
+    SystemEvents.Quit()
+    return report
+
+
+__all__ = ["CYCLES_PER_FRAME", "run_frame", "load", "run", "run_rom"]
@@ -0,0 +1,134 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+from project.src.components import memory
+from project.src.components.register import registry
+
+# host subsystems by the file their code lives in, checked innermost frame first
+SUBSYSTEMS = (
+    ("cpu.py", "CPU"),
+    ("alu.py", "CPU"),
+    ("memory.py", "memory"),
+    ("cartridge.py", "memory"),
+    ("battery.py", "memory"),
+    ("ppu.py", "PPU"),
+    ("bus.py", "bus"),
+    ("gui", "GUI"),
+)
+
+
+def _subsystem(filename: str) -> str | None:
+    # generated handlers and blocks are compiled from strings, so their file names are in angle brackets
+    if filename.startswith("<"):
+        return "CPU"
+    for part, subsystem in SUBSYSTEMS:
+        if part in filename:
+            return subsystem
+    return None
+
+
+def _region(pc: int) -> str:
+    if pc < 0x4000:
+        return "bank 00"
+    elif pc < 0x8000:
+        return f"bank {memory.rom_bank():02X}"
+    elif pc < 0xA000:
+        return "vram"
+    elif pc < 0xC000:
+        return "cart ram"
+    elif pc < 0xFE00:
+        return "wram"
+    elif pc < 0xFEA0:
+        return "oam"
+    elif pc < 0xFF00:
+        return "unusable"
+    elif pc < 0xFF80:
+        return "io"
+    elif pc < 0xFFFF:
+        return "hram"
+    return "ie"
+
+
+class SamplingProfiler:
+    """Samples a thread at a fixed interval and attributes each sample to guest and host code.
+
+    Every sample becomes a stack of the ROM bank or memory region the guest PC is in, the PC range,
+    the opcode being run, the host subsystem and the innermost host function, weighted by the
+    microseconds of the interval and written out in the collapsed stack format flamegraph tools read.
+    The sampler only runs once the sampled thread lets go of the GIL, so a late sample is still worth
+    one interval: weighting it by the time waited would credit all of that time to wherever the
+    thread let go, which is mostly NumPy and other code that releases the GIL."""
+
+    def __init__(self, interval: float = 0.001, pc_granularity: int = 0x100, thread_id: int | None = None):
+        self.interval = interval
+        self.pc_granularity = pc_granularity
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def _opcode(self, frame) -> str:
+        while frame is not None:
+            name = frame.f_code.co_name
+            if name.startswith(("op_", "cb_")):
+                return f"{name} {frame.f_code.co_filename.strip('<>')}"
+            elif name == "block":
+                return frame.f_code.co_filename.strip("<>")
+            frame = frame.f_back
+        # between handlers, fetching and dispatching the next opcode
+        return "dispatch"
+
+    def _host(self, frame) -> tuple[str, str]:
+        innermost = f"{frame.f_code.co_name} ({Path(frame.f_code.co_filename).name})"
+        while frame is not None:
+            if subsystem := _subsystem(frame.f_code.co_filename):
+                return subsystem, innermost
+            frame = frame.f_back
+        return "other", innermost
+
+    def sample(self, weight: int = 1):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        pc = registry.PC
+        start = pc - pc % self.pc_granularity
+        range_ = f"pc {start:04X}-{min(start + self.pc_granularity, 0x10000) - 1:04X}"
+        self.samples[(_region(pc), range_, self._opcode(frame), *self._host(frame))] += weight
+
+    def _run(self):
+        weight = round(self.interval * 1e6)
+        while not self._stopped.wait(self.interval):
+            self.sample(weight)
+
+    def start(self):
+        # the sampler only runs when it gets the GIL, so it has to be handed over at least as often as we sample
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            sys.setswitchinterval(self._switch_interval)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common())
+
+    def write_collapsed(self, path: Path | str):
+        Path(path).write_text(self.collapsed())
+
+
+__all__ = ["SamplingProfiler"]
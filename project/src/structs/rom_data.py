@@ -1,9 +1,37 @@
+import mmap
 import zipfile
 from pathlib import Path
-from tkinter import messagebox
 
 from project.src.system import bus as dd, GuiEvents, ComponentEvents
 
+CHUNK_SIZE = 0x4000
+
+
+def read_zipped_rom(zip_file: zipfile.ZipFile, info: zipfile.ZipInfo) -> memoryview:
+    """Decompress a zip member straight into a buffer sized from its entry, growing it if the entry undersells it."""
+    buffer = bytearray(info.file_size)
+    position = 0
+    with zip_file.open(info) as member:
+        while True:
+            if position == len(buffer):
+                if not (extra := member.read(CHUNK_SIZE)):
+                    break
+                buffer += extra
+                position += len(extra)
+                continue
+            with memoryview(buffer) as view, view[position:] as rest:
+                read = member.readinto(rest)
+            if not read:
+                break
+            position += read
+    return memoryview(buffer)[:position]
+
+
+def map_rom(file: Path) -> mmap.mmap:
+    """Map the ROM read only, so its pages are loaded on demand and shared through the page cache."""
+    with open(file, "rb") as rom_file:
+        return mmap.mmap(rom_file.fileno(), 0, access=mmap.ACCESS_READ)
+
 
 @GuiEvents.LoadRomFromLibrary
 def load_rom_data(file: Path | str):
@@ -22,16 +50,14 @@ def load_rom_data(file: Path | str):
 
     if file.suffix == ".zip":
         with zipfile.ZipFile(file) as zip_file:
-            for name in zip_file.namelist():
-                if name.endswith(allowed_suffixes):
-                    file_contents = zip_file.open(name)
-                    rom_data = file_contents.read()
+            for info in zip_file.infolist():
+                if info.filename.endswith(allowed_suffixes):
+                    rom_data = read_zipped_rom(zip_file, info)
                     break
             else:
                 raise ValueError("No valid ROM file found in ZIP file.")
     else:
-        with open(file, "rb") as rom_file:
-            rom_data = rom_file.read()
+        rom_data = map_rom(file)
 
     ComponentEvents.RomLoaded(rom_data)
 
@@ -44,6 +70,8 @@ def delete_rom(file_path: Path | str):
     if not file_path.exists():
         raise FileNotFoundError(f"ROM file {file_path} does not exist.")
 
+    from tkinter import messagebox
+
     if messagebox.askyesno("Confirmation", f"Are you sure to delete {file_path}?"):
         file_path.unlink()
         GuiEvents.UpdateRomLibrary()
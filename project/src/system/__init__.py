@@ -1,9 +1,11 @@
 import pprint
 from enum import auto
+from logging import CRITICAL, DEBUG, ERROR, INFO, WARNING
 from .config import * ; load_config()
 from .system_paths import *
 from .gb_logger import *
 from .bus import *
+from .cache import *
 
 
 class LogEvent(Event):
@@ -14,11 +16,17 @@ class LogEvent(Event):
     LogDebug = auto()
     LogToggleOutput = auto()
 
+    def __call__(self, message=None, *args):
+        # log messages are always emitted, so lazy callables are not mistaken for subscribers
+        for callback in self._callbacks:
+            callback(message, *args)
+
 
 class SystemEvents(Event):
     Quit = auto()
     ExceptionRaised = auto()
     SettingsUpdated = auto()
+    RequestBusStats = auto()
 
 
 class GuiEvents(Event):
@@ -31,6 +39,8 @@ class GuiEvents(Event):
     RequestMemoryStatus = auto()
     DeleteRomFromLibrary = auto()
     RequestRegistryStatus = auto()
+    RequestBusStatus = auto()
+    RequestHotspotStatus = auto()
 
 
 class ComponentEvents(Event):
@@ -39,11 +49,22 @@ class ComponentEvents(Event):
 
     HeaderLoaded = auto()
     RequestReset = auto()
+    RequestSaveState = auto()
+    RequestLoadState = auto()
+    RequestRewind = auto()
+    FrameCompleted = auto()
 
     RequestExecute = auto()
+    RequestExecutionCounts = auto()
 
     RequestMemoryRead = auto()
     RequestMemoryWrite = auto()
+    RequestMemoryReadBlock = auto()
+    RequestMemoryWriteBlock = auto()
+
+    RequestRomBank = auto()
+    RequestWatchCode = auto()
+    CodeModified = auto()
 
     RequestRegisterRead = auto()
     RequestRegisterWrite = auto()
@@ -68,33 +89,65 @@ class ComponentEvents(Event):
 
     RequestVideoRead = auto()
     RequestVideoWrite = auto()
+    RequestTileCacheStats = auto()
 
     RequestAudioRead = auto()
     RequestAudioWrite = auto()
 
 
 
-LogEvent.LogDebug.subscribe(logger.debug)
-LogEvent.LogInfo.subscribe(logger.info)
-LogEvent.LogCritical.subscribe(logger.critical)
-LogEvent.LogWarning.subscribe(logger.warning)
-LogEvent.LogError.subscribe(logger.error)
+_log_levels = {
+    LogEvent.LogDebug: DEBUG,
+    LogEvent.LogInfo: INFO,
+    LogEvent.LogWarning: WARNING,
+    LogEvent.LogError: ERROR,
+    LogEvent.LogCritical: CRITICAL,
+}
+
+
+def _make_log(level):
+    def log(message, *args):
+        if callable(message):
+            message = message()
+        logger.log(level, message, *args)
+
+    return log
+
 
-LogEvent.LogToggleOutput.subscribe(lambda mode: logger.setLevel(mode))
+def _update_log_gates():
+    for event, level in _log_levels.items():
+        event.set_enabled(logger.isEnabledFor(level))
+
+
+def _set_log_level(level):
+    logger.setLevel(level)
+    _update_log_gates()
+
+
+for _event, _level in _log_levels.items():
+    _event.subscribe(_make_log(_level))
+_update_log_gates()
+
+LogEvent.LogToggleOutput.subscribe(_set_log_level)
 
 SystemEvents.SettingsUpdated.subscribe(
-    lambda: logger.setLevel(
+    lambda: _set_log_level(
         'DEBUG'
         if get_value('developer', 'debug logging')
         else 'INFO'
     ))
 
+SystemEvents.SettingsUpdated.subscribe(lambda: bus.instrument(get_value('developer', 'instrument bus')))
+bus.instrument(get_value('developer', 'instrument bus'))
+SystemEvents.RequestBusStats.allow_requests(bus.get_stats)
+GuiEvents.RequestBusStatus.allow_requests(bus.format_stats)
+
 SystemEvents.ExceptionRaised.subscribe(LogEvent.LogError.emit)
 
 if events := Event.get_all_events():
     LogEvent.LogInfo.emit(f'System loaded {len(events)} events')
-    LogEvent.LogDebug.emit(f'Events: \n{pprint.pformat(list(events.keys()), indent=4)}')
+    LogEvent.LogDebug(lambda: f'Events: \n{pprint.pformat(list(events.keys()), indent=4)}')
 
 LogEvent.LogDebug.emit('System initialized')
 
-__all__ = ["bus", 'system_paths', 'config', 'LogEvent', 'SystemEvents', 'GuiEvents', 'ComponentEvents']
+__all__ = ["bus", 'system_paths', 'config', 'cache', 'LogEvent', 'SystemEvents', 'GuiEvents', 'ComponentEvents']
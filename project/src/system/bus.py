@@ -1,19 +1,41 @@
+from collections import deque
 from enum import IntFlag
 from enum import auto, Flag
+from functools import partial
 from itertools import count
+from threading import Lock
+from time import perf_counter
 from types import FunctionType, MethodType
 from typing import Any, Callable, Hashable
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
 Callback = Callable[..., Any]
 CallbackList = List[Callback]
 Callbacks = Dict[Hashable, Dict["Priority", CallbackList]]
+DispatchTable = Dict[Hashable, Tuple[Callback, ...]]
 
 _event_id_generator = count()
 
 _broadcasts: Callbacks = dict()
+_dispatch: DispatchTable = dict()
+_providers: Dict[Hashable, Callable] = dict()
 _allowed_requests: Dict[Hashable, Callable] = dict()
+_bound_requests: Dict[Hashable, List[Tuple[dict, str]]] = dict()
+_bound_handles: Dict[Hashable, "BoundRequest"] = dict()
+_disabled: set = set()
+
+_queued: Dict[Hashable, bool] = dict()
+_deferred: DispatchTable = dict()
+_queue: deque = deque()
+_pending: Dict[Hashable, Tuple[tuple, dict]] = dict()
+# emits and drain run on different threads, and a coalesced event's marker and arguments change together
+_pending_lock = Lock()
+
+_instrumented = False
+_emit_counts: Dict[Hashable, int] = dict()
+_request_counts: Dict[Hashable, int] = dict()
+_callback_timings: Dict[Tuple[Hashable, Callback], List[float]] = dict()
 
 
 class Priority(IntFlag):
@@ -29,6 +51,10 @@ class Event(Flag):
     def _generate_next_value_(*_):
         return next(_event_id_generator)
 
+    def __init__(self, *_):
+        # flattened, priority sorted callbacks, kept on the member itself so emitting skips the enum __hash__
+        self._callbacks = ()
+
     def subscribe(self, callback: Callback, priority: Priority = Priority.MEDIUM) -> None:
         subscribe(self, callback, priority)
 
@@ -36,16 +62,31 @@ class Event(Flag):
         return lambda f: self.subscribe(f, priority)
 
     def emit(self, *args, **kwargs) -> None:
-        emit(self, *args, **kwargs)
+        for callback in self._callbacks:
+            callback(*args, **kwargs)
 
     def subscribers(self) -> list:
-        return _broadcasts.get(self, [])
+        return list(self._callbacks)
+
+    @property
+    def enabled(self) -> bool:
+        return self not in _disabled
+
+    def set_enabled(self, enabled: bool) -> None:
+        set_enabled(self, enabled)
+
+    def set_queued(self, queued: bool = True, coalesce: bool = True) -> None:
+        set_queued(self, queued, coalesce)
 
     def request_data(self, *args, **kwargs) -> Any:
         return request_data(self, *args, **kwargs)
 
-    def allow_requests(self, f: Callable) -> None:
-        _allowed_requests.setdefault(self, f)
+    def allow_requests(self, f: Callable) -> Callable:
+        allow_requests(self, f)
+        return f
+
+    def bind(self, namespace: dict | None = None, name: str | None = None) -> Callable:
+        return bind(self, namespace, name)
 
     def __or__(self, other: object) -> object:
         return self, other
@@ -54,13 +95,15 @@ class Event(Flag):
         return other, self
 
     def __call__(self, v=None, *a, **k):
-        if v:
+        if v is not None:
             if isinstance(v, FunctionType) or isinstance(v, MethodType):
                 self.subscribe(v)
                 return v
-            self.emit(v, *a, **k)
+            for callback in self._callbacks:
+                callback(v, *a, **k)
         else:
-            self.emit(*a, **k)
+            for callback in self._callbacks:
+                callback(*a, **k)
 
     @staticmethod
     def get_all_events():
@@ -94,14 +137,110 @@ class EventGroup(tuple[Event, ...], Flag):
         self.emit(v, *a, **k)
 
 
+def _counted(event: Hashable) -> Callback:
+    _emit_counts.setdefault(event, 0)
+
+    def counter(*_, **__):
+        _emit_counts[event] += 1
+
+    return counter
+
+
+def _timed(event: Hashable, callback: Callback) -> Callback:
+    timings = _callback_timings.setdefault((event, callback), [0, 0.0, 0.0])
+
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            timings[0] += 1
+            timings[1] += elapsed
+            if elapsed > timings[2]:
+                timings[2] = elapsed
+
+    return timed
+
+
+def _timed_request(event: Hashable, provider: Callable) -> Callable:
+    _request_counts.setdefault(event, 0)
+    timed = _timed(event, provider)
+
+    def request(*args, **kwargs):
+        _request_counts[event] += 1
+        return timed(*args, **kwargs)
+
+    return request
+
+
+def _compile(event: Hashable):
+    priorities = _broadcasts.get(event, {})
+    if event in _disabled:
+        callbacks = ()
+    else:
+        callbacks = tuple(callback for priority in sorted(priorities) for callback in priorities[priority])
+        if _instrumented:
+            callbacks = (_counted(event), *(_timed(event, callback) for callback in callbacks))
+        if event in _queued:
+            _deferred[event] = callbacks
+            callbacks = (_enqueuer(event, _queued[event]),)
+    _dispatch[event] = callbacks
+    if isinstance(event, Event):
+        event._callbacks = callbacks
+
+
 def emit(event: Hashable, *args, **kwargs):
-    for priority in _broadcasts.get(event, {}).values():
-        for callback in priority:
-            callback(*args, **kwargs)
+    for callback in _dispatch.get(event, ()):
+        callback(*args, **kwargs)
 
 
 def subscribe(event: Hashable, callback: Callback, priority: Priority = Priority.MEDIUM):
     _broadcasts.setdefault(event, {}).setdefault(priority, []).append(callback)
+    _compile(event)
+
+
+def set_enabled(event: Hashable, enabled: bool):
+    """Disabled events keep their subscribers but emitting them does nothing."""
+    if enabled:
+        _disabled.discard(event)
+    else:
+        _disabled.add(event)
+    _compile(event)
+
+
+def _enqueuer(event: Hashable, coalesce: bool) -> Callback:
+    if coalesce:
+        def enqueue(*args, **kwargs):
+            # only the latest arguments are kept, delivered where the first emit since the last drain queued them
+            with _pending_lock:
+                if event not in _pending:
+                    _queue.append((event, None, None))
+                _pending[event] = (args, kwargs)
+    else:
+        def enqueue(*args, **kwargs):
+            _queue.append((event, args, kwargs))
+
+    return enqueue
+
+
+def set_queued(event: Hashable, queued: bool = True, coalesce: bool = True):
+    """Queued events are delivered by drain, on whichever thread calls it, instead of on emit."""
+    if queued:
+        _queued[event] = coalesce
+    else:
+        _queued.pop(event, None)
+    _compile(event)
+
+
+def drain():
+    for _ in range(len(_queue)):
+        with _pending_lock:
+            event, args, kwargs = _queue.popleft()
+            if args is None:
+                args, kwargs = _pending.pop(event)
+        for callback in _deferred.get(event, ()):
+            callback(*args, **kwargs)
 
 
 def subscribes_to(event: Hashable, priority: Priority = Priority.MEDIUM) -> Callable:
@@ -112,8 +251,33 @@ def subscribes_to(event: Hashable, priority: Priority = Priority.MEDIUM) -> Call
     return decorator
 
 
+class BoundRequest:
+    """Calls whichever provider currently answers an event's requests, for callers without a namespace to bind into."""
+
+    __slots__ = ("event", "provider")
+
+    def __init__(self, event: Hashable):
+        self.event = event
+        self.provider = _allowed_requests.get(event) or partial(request_data, event)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.provider(*args, **kwargs)
+
+
+def _resolve(event: Hashable):
+    provider = _providers[event]
+    if _instrumented:
+        provider = _timed_request(event, provider)
+    _allowed_requests[event] = provider
+    for namespace, name in _bound_requests.get(event, ()):
+        namespace[name] = provider
+    if (handle := _bound_handles.get(event)) is not None:
+        handle.provider = provider
+
+
 def allow_requests(observed_key: Hashable, observed_function: Callable) -> None:
-    _allowed_requests[observed_key] = observed_function
+    _providers[observed_key] = observed_function
+    _resolve(observed_key)
 
 
 def allows_requests(observable_key: Hashable) -> Callable:
@@ -127,13 +291,98 @@ def request_data(event: Hashable, *args, **kwargs) -> Any:
         raise ValueError(f"Event {event} not allowed to be requested")
 
 
+def bind(event: Hashable, namespace: dict | None = None, name: str | None = None) -> Callable:
+    """Resolve a request provider once so it can be called directly.
+
+    Passing a namespace and name keeps namespace[name] in sync whenever the provider is swapped or
+    instrumented. Without one, a BoundRequest handle shared by every caller does the same.
+    """
+    if namespace is None:
+        if (handle := _bound_handles.get(event)) is None:
+            handle = _bound_handles[event] = BoundRequest(event)
+        return handle
+    bound = _bound_requests.setdefault(event, [])
+    if not any(bound_namespace is namespace and bound_name == name for bound_namespace, bound_name in bound):
+        bound.append((namespace, name))
+    namespace[name] = _allowed_requests.get(event) or partial(request_data, event)
+    return namespace[name]
+
+
+def instrument(enabled: bool = True):
+    """Count emits and requests per event and time every subscriber, at the cost of slower dispatch."""
+    global _instrumented
+    if enabled == _instrumented:
+        return
+    _instrumented = enabled
+    for event in {*Event.get_all_events().values(), *_broadcasts}:
+        _compile(event)
+    for event in _providers:
+        _resolve(event)
+
+
+def is_instrumented() -> bool:
+    return _instrumented
+
+
+def reset_stats():
+    _emit_counts.update(dict.fromkeys(_emit_counts, 0))
+    _request_counts.update(dict.fromkeys(_request_counts, 0))
+    for timings in _callback_timings.values():
+        timings[:] = [0, 0.0, 0.0]
+
+
+def _callback_name(callback: Callback) -> str:
+    name = getattr(callback, "__qualname__", repr(callback))
+    module = getattr(callback, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+def get_stats() -> dict:
+    return {
+        "emits": {str(event): count for event, count in _emit_counts.items() if count},
+        "requests": {str(event): count for event, count in _request_counts.items() if count},
+        "callbacks": {
+            f"{event} -> {_callback_name(callback)}": {"calls": calls, "total": total, "max": longest}
+            for (event, callback), (calls, total, longest) in _callback_timings.items()
+            if calls
+        },
+    }
+
+
+def format_stats(limit: int = 10) -> str:
+    if not _instrumented:
+        return "Bus instrumentation is disabled"
+    stats = get_stats()
+    counts = [("emit", event, count) for event, count in stats["emits"].items()]
+    counts += [("request", event, count) for event, count in stats["requests"].items()]
+    counts.sort(key=lambda item: item[2], reverse=True)
+    timings = sorted(stats["callbacks"].items(), key=lambda item: item[1]["total"], reverse=True)
+    lines = [f"{count:>10} {kind:<8}{event}" for kind, event, count in counts[:limit]]
+    lines.append("")
+    lines += [
+        f"{timing['total'] * 1000:>10.3f}ms total {timing['max'] * 1000:>8.3f}ms max {timing['calls']:>8} calls {name}"
+        for name, timing in timings[:limit]
+    ]
+    return "\n".join(lines)
+
+
 __all__ = [
     "Event",
     "Priority",
     "emit",
     "subscribe",
+    "set_enabled",
+    "set_queued",
+    "drain",
     "subscribes_to",
     "allow_requests",
     "allows_requests",
     "request_data",
+    "bind",
+    "BoundRequest",
+    "instrument",
+    "is_instrumented",
+    "reset_stats",
+    "get_stats",
+    "format_stats",
 ]
@@ -0,0 +1,48 @@
+import hashlib
+import marshal
+import os
+import sys
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+
+from .config import user_path
+
+cache_path = user_path / "cache"
+
+
+def source_key(*files: Path | str) -> str:
+    """Hash the files a cached value is built from, along with the bytecode version it was built by."""
+    digest = hashlib.sha256(MAGIC_NUMBER)
+    for file in files:
+        try:
+            digest.update(Path(file).read_bytes())
+        except OSError:
+            # frozen builds don't ship their sources, but the executable changes whenever they do
+            if not getattr(sys, "frozen", False):
+                raise
+            stat = os.stat(sys.executable)
+            digest.update(f"{file}{stat.st_size}{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def cached(name: str, key: str, build):
+    """Return build(), marshalled into the cache directory and loaded from there while the key matches."""
+    file = cache_path / f"{name}.marshal"
+    try:
+        stored_key, value = marshal.loads(file.read_bytes())
+        if stored_key == key:
+            return value
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    value = build()
+    try:
+        cache_path.mkdir(parents=True, exist_ok=True)
+        temporary = file.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(marshal.dumps((key, value)))
+        temporary.replace(file)
+    except OSError:
+        pass
+    return value
+
+
+__all__ = ["cache_path", "source_key", "cached"]
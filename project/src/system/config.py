@@ -22,9 +22,17 @@ defaults = {
     "video": {},
     "sound": {},
     "input": {},
+    "rewind": {
+        "enabled": (False, bool),
+        "interval frames": (4, int),
+        "memory budget mb": (32, int),
+    },
     "developer": {
         "debug": (False, bool),
         "debug logging": (False, bool),
+        "instrument bus": (False, bool),
+        "block cache": (False, bool),
+        "count instructions": (False, bool),
     },
 }
 
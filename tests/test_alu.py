@@ -0,0 +1,127 @@
+import unittest
+
+from project.src.components import alu
+
+
+def flags(z, n, h, c):
+    return (0x80 if z else 0) | (0x40 if n else 0) | (0x20 if h else 0) | (0x10 if c else 0)
+
+
+def reference_add(a, b, carry):
+    result = (a + b + carry) % 256
+    half_carry = (a % 16) + (b % 16) + carry >= 16
+    return result, flags(result == 0, False, half_carry, a + b + carry >= 256)
+
+
+def reference_sub(a, b, carry):
+    result = (a - b - carry) % 256
+    half_borrow = (a % 16) < (b % 16) + carry
+    return result, flags(result == 0, True, half_borrow, a < b + carry)
+
+
+def reference_daa(a, n, h, c):
+    correction = 0
+    if h or (not n and a % 16 > 9):
+        correction += 0x06
+    if c or (not n and a > 0x99):
+        correction += 0x60
+        c = True
+    result = (a - correction if n else a + correction) % 256
+    return result, flags(result == 0, n, False, c)
+
+
+def reference_rotate(mnemonic, value, carry):
+    bits = [value >> i & 1 for i in range(8)]
+    if mnemonic == "RLC":
+        out = bits[7]
+        bits = [bits[7]] + bits[:7]
+    elif mnemonic == "RL":
+        out = bits[7]
+        bits = [carry] + bits[:7]
+    elif mnemonic == "RRC":
+        out = bits[0]
+        bits = bits[1:] + [bits[0]]
+    elif mnemonic == "RR":
+        out = bits[0]
+        bits = bits[1:] + [carry]
+    elif mnemonic == "SLA":
+        out = bits[7]
+        bits = [0] + bits[:7]
+    elif mnemonic == "SRA":
+        out = bits[0]
+        bits = bits[1:] + [bits[7]]
+    elif mnemonic == "SRL":
+        out = bits[0]
+        bits = bits[1:] + [0]
+    else:
+        out = 0
+        bits = bits[4:] + bits[:4]
+    result = sum(bit << i for i, bit in enumerate(bits))
+    return result, flags(result == 0, False, False, out)
+
+
+def unpack(entry):
+    return entry & 0xFF, entry >> 8
+
+
+class TestALU(unittest.TestCase):
+    def test_add(self):
+        for carry in (0, 1):
+            for a in range(256):
+                for b in range(256):
+                    self.assertEqual(unpack(alu.ADD[carry << 16 | a << 8 | b]), reference_add(a, b, carry))
+
+    def test_sub(self):
+        for carry in (0, 1):
+            for a in range(256):
+                for b in range(256):
+                    self.assertEqual(unpack(alu.SUB[carry << 16 | a << 8 | b]), reference_sub(a, b, carry))
+
+    def test_logical(self):
+        for a in range(256):
+            for b in range(256):
+                index = a << 8 | b
+                self.assertEqual(unpack(alu.AND[index]), (a & b, flags(a & b == 0, False, True, False)))
+                self.assertEqual(unpack(alu.XOR[index]), (a ^ b, flags(a ^ b == 0, False, False, False)))
+                self.assertEqual(unpack(alu.OR[index]), (a | b, flags(a | b == 0, False, False, False)))
+
+    def test_inc_dec(self):
+        for carry in (0, 1):
+            for value in range(256):
+                inc, dec = (value + 1) % 256, (value - 1) % 256
+                self.assertEqual(
+                    unpack(alu.INC[carry << 8 | value]), (inc, flags(inc == 0, False, value % 16 == 15, carry))
+                )
+                self.assertEqual(
+                    unpack(alu.DEC[carry << 8 | value]), (dec, flags(dec == 0, True, value % 16 == 0, carry))
+                )
+
+    def test_rotates(self):
+        for mnemonic in ("RLC", "RRC", "RL", "RR", "SLA", "SRA", "SRL", "SWAP"):
+            table = getattr(alu, mnemonic)
+            accumulator_table = getattr(alu, mnemonic + "A", None)
+            for carry in (0, 1):
+                for value in range(256):
+                    result, f = reference_rotate(mnemonic, value, carry)
+                    self.assertEqual(unpack(table[carry << 8 | value]), (result, f), mnemonic)
+                    if accumulator_table:
+                        self.assertEqual(unpack(accumulator_table[carry << 8 | value]), (result, f & 0x7F), mnemonic)
+
+    def test_daa(self):
+        for n in (0, 1):
+            for h in (0, 1):
+                for c in (0, 1):
+                    for a in range(256):
+                        entry = alu.DAA[(n << 2 | h << 1 | c) << 8 | a]
+                        self.assertEqual(unpack(entry), reference_daa(a, n, h, c))
+
+    def test_daa_after_add(self):
+        for x in range(100):
+            for y in range(100):
+                a = x // 10 << 4 | x % 10
+                b = y // 10 << 4 | y % 10
+                result, f = unpack(alu.ADD[a << 8 | b])
+                result, f = unpack(alu.DAA[(f >> 4 & 0x7) << 8 | result])
+                total = (x + y) % 100
+                self.assertEqual(result, total // 10 << 4 | total % 10)
+                self.assertEqual(bool(f & alu.C_FLAG), x + y >= 100)
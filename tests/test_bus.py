@@ -0,0 +1,158 @@
+import sys
+import threading
+import unittest
+from enum import auto
+
+from project.src.system import LogEvent, SystemEvents, set_value
+from project.src.system import bus
+from project.src.system.bus import Event, Priority
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class BusEvents(Event):
+    Ordered = auto()
+    Provided = auto()
+    Unprovided = auto()
+    Muted = auto()
+    Instrumented = auto()
+    Queued = auto()
+    Coalesced = auto()
+    Handled = auto()
+    Rebound = auto()
+    Contended = auto()
+
+
+class TestBus(unittest.TestCase):
+    def test_priority_order(self):
+        calls = []
+        BusEvents.Ordered.subscribe(lambda: calls.append("low"), Priority.LOW)
+        BusEvents.Ordered.subscribe(lambda: calls.append("critical"), Priority.CRITICAL)
+        BusEvents.Ordered.subscribe(lambda: calls.append("medium"))
+        BusEvents.Ordered.emit()
+        self.assertEqual(calls, ["critical", "medium", "low"])
+
+    def test_bind_follows_provider(self):
+        namespace = {}
+        BusEvents.Provided.allow_requests(lambda: 1)
+        handle = BusEvents.Provided.bind(namespace, "handle")
+        self.assertEqual(handle(), 1)
+        BusEvents.Provided.allow_requests(lambda: 2)
+        self.assertEqual(namespace["handle"](), 2)
+        self.assertEqual(BusEvents.Provided.request_data(), 2)
+
+    def test_bind_before_provider(self):
+        namespace = {}
+        BusEvents.Unprovided.bind(namespace, "handle")
+        with self.assertRaises(ValueError):
+            namespace["handle"]()
+        BusEvents.Unprovided.allow_requests(lambda: 3)
+        self.assertEqual(namespace["handle"](), 3)
+
+    def test_bind_handle_follows_provider(self):
+        handle = BusEvents.Handled.bind()
+        with self.assertRaises(ValueError):
+            handle()
+        BusEvents.Handled.allow_requests(lambda: 5)
+        self.assertEqual(handle(), 5)
+        BusEvents.Handled.allow_requests(lambda: 6)
+        self.assertEqual(handle(), 6)
+        self.assertIs(BusEvents.Handled.bind(), handle)
+        bus.instrument()
+        try:
+            handle()
+            self.assertEqual(SystemEvents.RequestBusStats.request_data()["requests"]["BusEvents.Handled"], 1)
+        finally:
+            bus.instrument(False)
+
+    def test_bind_twice(self):
+        namespace = {}
+        BusEvents.Rebound.bind(namespace, "handle")
+        BusEvents.Rebound.bind(namespace, "handle")
+        BusEvents.Rebound.bind(namespace, "other")
+        self.assertEqual(bus._bound_requests[BusEvents.Rebound], [(namespace, "handle"), (namespace, "other")])
+
+    def test_disabled_event_keeps_subscribers(self):
+        calls = []
+        BusEvents.Muted.subscribe(calls.append)
+        BusEvents.Muted.set_enabled(False)
+        BusEvents.Muted.emit(1)
+        BusEvents.Muted.set_enabled(True)
+        BusEvents.Muted.emit(2)
+        self.assertEqual(calls, [2])
+
+    def test_debug_log_gate(self):
+        self.assertFalse(LogEvent.LogDebug.enabled)
+        self.assertTrue(LogEvent.LogInfo.enabled)
+        LogEvent.LogDebug(lambda: self.fail("lazy message was formatted"))
+
+    def test_instrumentation(self):
+        calls = []
+        BusEvents.Instrumented.subscribe(calls.append)
+        BusEvents.Instrumented.allow_requests(lambda: 4)
+        bus.instrument()
+        try:
+            BusEvents.Instrumented.emit(1)
+            BusEvents.Instrumented.emit(2)
+            self.assertEqual(BusEvents.Instrumented.request_data(), 4)
+            stats = SystemEvents.RequestBusStats.request_data()
+        finally:
+            bus.instrument(False)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(stats["emits"]["BusEvents.Instrumented"], 2)
+        self.assertEqual(stats["requests"]["BusEvents.Instrumented"], 1)
+        self.assertEqual(stats["callbacks"]["BusEvents.Instrumented -> list.append"]["calls"], 2)
+
+    def test_queued_delivery(self):
+        calls = []
+        BusEvents.Queued.subscribe(calls.append)
+        BusEvents.Coalesced.subscribe(lambda value: calls.append(-value))
+        BusEvents.Queued.set_queued(coalesce=False)
+        BusEvents.Coalesced.set_queued()
+        for value in range(1, 4):
+            BusEvents.Queued.emit(value)
+            BusEvents.Coalesced.emit(value)
+        self.assertEqual(calls, [])
+        # coalesced emits share one queue entry
+        self.assertEqual(len(bus._queue), 4)
+        bus.drain()
+        self.assertEqual(calls, [1, -3, 2, 3])
+        bus.drain()
+        self.assertEqual(calls, [1, -3, 2, 3])
+
+    def test_coalesced_across_threads(self):
+        calls = []
+        BusEvents.Contended.subscribe(calls.append)
+        BusEvents.Contended.set_queued()
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        stopped = threading.Event()
+
+        def emit(thread):
+            for value in range(2000):
+                BusEvents.Contended.emit((thread, value))
+
+        def drain():
+            while not stopped.is_set():
+                bus.drain()
+
+        drainer = threading.Thread(target=drain)
+        emitters = [threading.Thread(target=emit, args=(thread,)) for thread in range(4)]
+        try:
+            drainer.start()
+            for emitter in emitters:
+                emitter.start()
+            for emitter in emitters:
+                emitter.join()
+        finally:
+            stopped.set()
+            drainer.join()
+            sys.setswitchinterval(switch_interval)
+        bus.drain()
+        self.assertEqual(bus._pending, {})
+        self.assertEqual(len(bus._queue), 0)
+        # still delivered once the threads are done, so no emit left it stuck
+        BusEvents.Contended.emit("last")
+        bus.drain()
+        self.assertEqual(calls[-1], "last")
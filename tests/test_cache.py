@@ -0,0 +1,55 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from project.src.system import cache
+from project.src.components.instruction import Instruction
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path, cache.cache_path = cache.cache_path, Path(self.directory.name)
+        self.builds = 0
+
+    def tearDown(self):
+        cache.cache_path = self.cache_path
+        self.directory.cleanup()
+
+    def _build(self):
+        self.builds += 1
+        return {"table": [1, 2, 3], "code": compile("x = 1", "<test>", "exec")}
+
+    def test_cached(self):
+        first = cache.cached("test", "a", self._build)
+        second = cache.cached("test", "a", self._build)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(first["table"], second["table"])
+        self.assertEqual(first["code"].co_filename, second["code"].co_filename)
+        cache.cached("test", "b", self._build)
+        self.assertEqual(self.builds, 2)
+
+    def test_corrupt(self):
+        (cache.cache_path / "test.marshal").write_bytes(b"not marshal")
+        self.assertEqual(cache.cached("test", "a", self._build)["table"], [1, 2, 3])
+        self.assertEqual(self.builds, 1)
+
+    def test_source_key(self):
+        file = cache.cache_path / "source.py"
+        file.write_text("a = 1")
+        key = cache.source_key(file)
+        self.assertEqual(cache.source_key(file), key)
+        file.write_text("a = 2")
+        self.assertNotEqual(cache.source_key(file), key)
+
+    def test_missing_source(self):
+        missing = cache.cache_path / "missing.py"
+        with self.assertRaises(FileNotFoundError):
+            cache.source_key(missing)
+        with self.assertRaisesRegex(FileNotFoundError, "Could not find"):
+            Instruction.load(missing)
+        # only a frozen build falls back to keying on the executable
+        with mock.patch.object(sys, "frozen", True, create=True):
+            self.assertEqual(cache.source_key(missing), cache.source_key(missing))
@@ -0,0 +1,111 @@
+from hypothesis import given, strategies as st
+import tempfile
+import unittest
+
+from project.src.system import set_value, SystemEvents
+from project.src.components import cartridge
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+def _rom(cartridge_type: int, rom_size: int, ram_size: int = 0x00) -> bytes:
+    size = cartridge.ROM_SIZES[rom_size]
+    rom = bytearray(size)
+    for bank in range(size // cartridge.ROM_BANK_SIZE):
+        rom[bank * cartridge.ROM_BANK_SIZE : bank * cartridge.ROM_BANK_SIZE + 2] = bank.to_bytes(2, "little")
+    rom[0x147], rom[0x148], rom[0x149] = cartridge_type, rom_size, ram_size
+    return bytes(rom)
+
+
+class TestMappers(unittest.TestCase):
+    def _bank(self, cart, address=cartridge.ROM_BANK_START):
+        return int.from_bytes(bytes(cart.read_block(address, 2)), "little")
+
+    def test_mapper_types(self):
+        self.assertIs(type(cartridge.load_cart(_rom(0x00, 0x00))), cartridge.Cart)
+        self.assertIs(type(cartridge.load_cart(_rom(0x03, 0x02, 0x02))), cartridge.MBC1)
+        self.assertIs(type(cartridge.load_cart(_rom(0x06, 0x02))), cartridge.MBC2)
+        self.assertIs(type(cartridge.load_cart(_rom(0x10, 0x02, 0x03))), cartridge.MBC3)
+        self.assertIs(type(cartridge.load_cart(_rom(0x1B, 0x02, 0x03))), cartridge.MBC5)
+
+    @given(st.integers(min_value=0x2000, max_value=0x3FFF), st.integers(min_value=0, max_value=0xFF))
+    def test_mbc1_rom_bank(self, address, value):
+        cart = cartridge.load_cart(_rom(0x01, 0x04))
+        cart.write(address, value)
+        self.assertEqual(self._bank(cart), (value & 0x1F or 1) % 32)
+
+    def test_mbc1_mode(self):
+        cart = cartridge.load_cart(_rom(0x01, 0x06))
+        cart.write(0x2000, 0x05)
+        cart.write(0x5FFF, 0x02)
+        self.assertEqual(self._bank(cart), 0x45)
+        self.assertEqual(self._bank(cart, 0x0000), 0)
+        cart.write(0x7000, 0x01)
+        self.assertEqual(self._bank(cart, 0x0000), 0x40)
+
+    def test_read_block_across_regions(self):
+        cart = cartridge.load_cart(_rom(0x02, 0x02, 0x02))
+        cart.write(0x0000, 0x0A)
+        cart.write(0x2000, 3)
+        cart.write(0xBFFF, 0x12)
+        self.assertEqual(bytes(cart.read_block(0x3FFF, 3)), bytes([0, 3, 0]))
+        self.assertEqual(bytes(cart.read_block(0xBFFF, 1)), bytes([0x12]))
+        for address in (0x7FF0, 0x9000, 0xBFF0, 0xC000):
+            with self.assertRaises(ValueError):
+                cart.read_block(address, 0x20)
+        mbc2 = cartridge.load_cart(_rom(0x06, 0x02))
+        mbc2.write(0x0000, 0x0A)
+        mbc2.write(0xA001, 0x12)
+        self.assertEqual(bytes(mbc2.read_block(0xA000, 2)), bytes([0xF0, 0xF2]))
+
+    def test_mbc2_ram(self):
+        cart = cartridge.load_cart(_rom(0x06, 0x02))
+        cart.write(0xA000, 0x12)
+        self.assertEqual(cart.read(0xA000), 0xFF)
+        cart.write(0x0000, 0x0A)
+        cart.write(0xA001, 0x12)
+        self.assertEqual(cart.read(0xA201), 0xF2)
+        cart.write(0x0100, 0x03)
+        self.assertEqual(self._bank(cart), 3)
+
+    def test_mbc3_rtc(self):
+        cart = cartridge.load_cart(_rom(0x10, 0x02, 0x03))
+        cart.write(0x0000, 0x0A)
+        cart.write(0x4000, 0x08)
+        cart.write(0xA000, 0x2A)
+        self.assertEqual(cart.read(0xA000), 0x00)
+        cart.write(0x6000, 0x00)
+        cart.write(0x6000, 0x01)
+        self.assertEqual(cart.read(0xA000), 0x2A)
+        cart.write(0x4000, 0x01)
+        cart.write(0xA000, 0x2B)
+        self.assertEqual(cart.ram[cartridge.RAM_BANK_SIZE], 0x2B)
+
+    @given(st.integers(min_value=0, max_value=0x1FF))
+    def test_mbc5_rom_bank(self, bank):
+        cart = cartridge.load_cart(_rom(0x19, 0x08))
+        cart.write(0x2FFF, bank & 0xFF)
+        cart.write(0x3000, bank >> 8)
+        self.assertEqual(self._bank(cart), bank)
+        self.assertEqual(cart.rom_bank, bank)
+
+
+class TestBattery(unittest.TestCase):
+    def test_save_file(self):
+        rom = _rom(0x1B, 0x02, 0x03)
+        with tempfile.TemporaryDirectory() as saves:
+            cart = cartridge.load_cart(rom, saves)
+            cart.write(0x0000, 0x0A)
+            cart.write(0x4000, 0x02)
+            cart.write(0xA100, 0x42)
+            self.assertEqual(cart.battery.flush(), 1)
+            self.assertEqual(cart.battery.flush(), 0)
+            cart.close()
+            save = cartridge.Path(saves) / cart.save_name
+            self.assertEqual(save.read_bytes()[2 * cartridge.RAM_BANK_SIZE + 0x100], 0x42)
+            cart = cartridge.load_cart(rom, saves)
+            cart.write(0x0000, 0x0A)
+            cart.write(0x4000, 0x02)
+            self.assertEqual(cart.read(0xA100), 0x42)
+            cart.close()
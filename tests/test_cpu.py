@@ -7,7 +7,8 @@ from hypothesis import (
     HealthCheck,
 )
 
-from project.src.components.instruction import instructions, cb_instructions
+from project.src.components import cpu, memory
+from project.src.components.instruction import Instruction, instructions, cb_instructions
 from project.src.system import ComponentEvents, SystemEvents, set_value
 
 set_value("developer", "debug logging", False)
@@ -23,4 +24,182 @@ class TestCPU(unittest.TestCase):
         ComponentEvents.RequestReset()
         ComponentEvents.RequestExecute(instruction)
 
+    def test_add_flags(self):
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestRegisterWrite("A", 0x0F)
+        ComponentEvents.RequestRegisterWrite("B", 0x01)
+        ComponentEvents.RequestExecute(instructions[0x80])
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 0x10)
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("F"), 0x20)
+
+    def test_sub_flags(self):
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestRegisterWrite("A", 0x01)
+        ComponentEvents.RequestRegisterWrite("C", 0x01)
+        ComponentEvents.RequestExecute(instructions[0x91])
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 0x00)
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("F"), 0xC0)
+
+    def _run_program(self, step):
+        program = {
+            0xFF80: [0x3E, 0x05],  # LD A, 5
+            0xFF82: [0x06, 0x03],  # LD B, 3
+            0xFF84: [0x80],  # ADD A, B
+            0xFF85: [0x21, 0xA0, 0xFF],  # LD HL, 0xFFA0
+            0xFF88: [0x22],  # LD (HL+), A
+            0xFF89: [0xCD, 0x90, 0xFF],  # CALL 0xFF90
+            0xFF8C: [0x76],  # HALT
+            0xFF90: [0x3C],  # INC A
+            0xFF91: [0xCB, 0x37],  # SWAP A
+            0xFF93: [0xC9],  # RET
+        }
+        for address, data in program.items():
+            for offset, value in enumerate(data):
+                ComponentEvents.RequestMemoryWrite(address + offset, value)
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestRegisterWrite("PC", 0xFF80)
+        ComponentEvents.RequestRegisterWrite("SP", 0xFFFE)
+        for _ in range(20):
+            if cpu.state.halted:
+                break
+            step()
+        read = ComponentEvents.RequestRegisterRead.request_data
+        self.assertTrue(cpu.state.halted)
+        self.assertEqual(read("A"), 0x90)
+        self.assertEqual(read("HL"), 0xFFA1)
+        self.assertEqual(read("PC"), 0xFF8D)
+        self.assertEqual(read("SP"), 0xFFFE)
+        self.assertEqual(ComponentEvents.RequestMemoryRead.request_data(0xFFA0), 0x08)
+        ComponentEvents.RequestReset()
+
+    def test_program(self):
+        self._run_program(cpu.step)
+
+    def test_program_blocks(self):
+        self._run_program(cpu.step_block)
+
+    def test_block_invalidation(self):
+        ComponentEvents.RequestReset()
+        for offset, value in enumerate([0x3C, 0x18, 0xFD]):  # INC A; JR -3
+            ComponentEvents.RequestMemoryWrite(0xFFC0 + offset, value)
+        ComponentEvents.RequestRegisterWrite("PC", 0xFFC0)
+        cpu.step_block()
+        cpu.step_block()
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 2)
+        ComponentEvents.RequestMemoryWrite(0xFFC0, 0x3D)  # DEC A
+        cpu.step_block()
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 1)
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("PC"), 0xFFC0)
+        ComponentEvents.RequestReset()
+
+    def test_io_writes_keep_hram_blocks(self):
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestMemoryWriteBlock(0xFFC0, bytes([0x3C, 0x18, 0xFD]))  # INC A; JR -3
+        ComponentEvents.RequestRegisterWrite("PC", 0xFFC0)
+        cpu.step_block()
+        ComponentEvents.RequestMemoryWrite(0xFF01, 0x12)
+        ComponentEvents.RequestMemoryWriteBlock(0xFF00, bytes(0x10))
+        self.assertIn(0xFFC0, cpu.blocks)
+        ComponentEvents.RequestMemoryWrite(0xFFFF, 0x00)
+        self.assertIn(0xFFC0, cpu.blocks)
+        ComponentEvents.RequestMemoryWriteBlock(0xFF70, bytes(0x20))
+        self.assertNotIn(0xFFC0, cpu.blocks)
+        ComponentEvents.RequestReset()
+
+    def test_echo_writes_invalidate_blocks(self):
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestMemoryWriteBlock(0xC100, bytes([0x3C, 0x18, 0xFD]))  # INC A; JR -3
+        ComponentEvents.RequestRegisterWrite("PC", 0xC100)
+        cpu.step_block()
+        cpu.step_block()
+        ComponentEvents.RequestMemoryWrite(0xE100, 0x3D)  # DEC A, through echo RAM
+        cpu.step_block()
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 1)
+        ComponentEvents.RequestReset()
+
+    def test_bank_switch_ends_block(self):
+        rom = bytearray(0x10000)
+        rom[0x147], rom[0x148] = 0x01, 0x01  # MBC1, four banks
+        rom[0x4000:0x4004] = bytes([0xEA, 0x00, 0x20, 0x04])  # bank 1: LD (0x2000), A; INC B
+        rom[0x8003] = 0x0C  # bank 2: INC C
+        memory.load_cartridge(rom)
+        self.addCleanup(memory.unload_cartridge)
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestRegisterWrite("A", 2)
+        ComponentEvents.RequestRegisterWrite("PC", 0x4000)
+        cpu.step_block()
+        cpu.step_block()
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("B"), 0)
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("C"), 1)
+
+    def test_self_modifying_block(self):
+        ComponentEvents.RequestReset()
+        # LD HL, 0xC006; LD (HL), 0x0C; INC B, where the INC B is overwritten with INC C
+        ComponentEvents.RequestMemoryWriteBlock(0xC000, bytes([0x21, 0x06, 0xC0, 0x36, 0x0C, 0x00, 0x04]))
+        ComponentEvents.RequestRegisterWrite("PC", 0xC000)
+        while ComponentEvents.RequestRegisterRead.request_data("PC") < 0xC007:
+            cpu.step_block()
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("B"), 0)
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("C"), 1)
+        ComponentEvents.RequestReset()
+
+    def test_stop_length(self):
+        for step in (cpu.step, cpu.step_block):
+            ComponentEvents.RequestReset()
+            ComponentEvents.RequestMemoryWriteBlock(0xC000, bytes([0x00, 0x10, 0x00]))  # NOP; STOP
+            ComponentEvents.RequestRegisterWrite("PC", 0xC000)
+            while not cpu.state.halted:
+                step()
+            self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("PC"), 0xC002, step.__name__)
+        ComponentEvents.RequestReset()
+
+    def test_execution_counts(self):
+        cpu.reset_counts()
+        cpu.set_counting(True)
+        try:
+            self._run_program(cpu.step_counting)
+            ComponentEvents.RequestExecute(instructions[0x00])
+            hotspots = cpu.format_hotspots(20)
+        finally:
+            cpu.set_counting(False)
+        counts = ComponentEvents.RequestExecutionCounts.request_data()
+        self.assertEqual(counts["opcodes"][0x3C], 1)
+        self.assertEqual(counts["opcodes"][0x100 | 0x37], 1)
+        self.assertEqual(counts["opcodes"][0x00], 1)
+        self.assertEqual(counts["pcs"][0xFF91], 1)
+        self.assertEqual(sum(counts["opcodes"]), 11)
+        self.assertEqual(cpu.hot_addresses(1), [("FF80", 1)])
+        self.assertIn("CB 37", hotspots)
+        self.assertNotIn("CB 37", cpu.format_hotspots(20))
+        cpu.reset_counts()
+
+    def test_hot_addresses(self):
+        cpu.reset_counts()
+        for pc, count in ((0x0150, 3), (0xC000, 5), (0xC001, 3)):
+            cpu.pc_counts[pc] = count
+        cpu.banked_pc_counts[2] = cpu.array("Q", bytes(8 * 0x4000))
+        cpu.banked_pc_counts[2][0x10] = 4
+        self.assertEqual(cpu.hot_addresses(3), [("C000", 5), ("02:4010", 4), ("0150", 3)])
+        cpu.reset_counts()
+
+    def test_execute_equal_instruction(self):
+        ComponentEvents.RequestReset()
+        ComponentEvents.RequestRegisterWrite("A", 0x12)
+        # copies, as a decoder or test would build them, run the handler of the table entry they equal
+        ComponentEvents.RequestExecute(Instruction(*cb_instructions[0x37]))  # SWAP A
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("A"), 0x21)
+        ComponentEvents.RequestExecute(Instruction(*instructions[0x37]))  # SCF
+        self.assertEqual(ComponentEvents.RequestRegisterRead.request_data("F") & 0x10, 0x10)
+        with self.assertRaises(ValueError):
+            cpu.execute(instructions[0x37]._replace(mnemonic="NOPE"))
+        ComponentEvents.RequestReset()
+
+    def test_fallback_counts(self):
+        missing = next(op_code for op_code in range(0x100) if op_code not in instructions)
+        cpu.reset_counts()
+        cpu.handlers[missing]()
+        self.assertEqual(cpu.fallback_counts[missing], 1)
+        self.assertIn("Not implemented", cpu.format_hotspots())
+        cpu.reset_counts()
+
     ComponentEvents.RequestReset()
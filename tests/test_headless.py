@@ -0,0 +1,45 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from project.src.system import set_value, SystemEvents
+from project.src import headless
+from project.src.components import register
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class TestHeadless(unittest.TestCase):
+    def test_no_gui_imports(self):
+        check = "import sys, project.src, project.src.headless; print(sorted({'tkinter', 'PIL'} & set(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.rom = Path(self.directory.name) / "test.gb"
+        rom = bytearray(0x8000)
+        rom[0x100:0x103] = bytes([0xC3, 0x50, 0x01])  # JP 0x0150
+        rom[0x150:0x156] = bytes([0x04, 0xE0, 0x80, 0x22, 0x18, 0xFA])  # INC B, LDH (0x80),A, LD (HL+),A, JR -6
+        self.rom.write_bytes(rom)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_run(self):
+        self.assertEqual(headless.run(self.rom, 1), 1)
+        self.assertNotEqual(register.registry.B, 0)
+        self.assertIn(register.registry.PC, range(0x150, 0x156))
+
+    def test_run_rom(self):
+        first = headless.run_rom(self.rom, 2)
+        second = headless.run_rom(self.rom, 2)
+        self.assertEqual(first["frames"], 2)
+        self.assertGreaterEqual(first["cycles"], 2 * headless.CYCLES_PER_FRAME)
+        self.assertGreater(first["cycles_per_second"], 0)
+        self.assertEqual(first["ram_hash"], second["ram_hash"])
+        self.assertEqual(first["framebuffer_hash"], second["framebuffer_hash"])
+        self.assertEqual(first["registers"], second["registers"])
@@ -1,8 +1,88 @@
 from project.src import bus as dd, memory
 from hypothesis import given, strategies as st
+import tempfile
 import unittest
 
-from project.src.system import set_value, SystemEvents
+from project.src.system import set_value, SystemEvents, ComponentEvents
 
 set_value('developer', 'debug logging', False)
-SystemEvents.SettingsUpdated()
\ No newline at end of file
+SystemEvents.SettingsUpdated()
+
+
+class TestMemoryMap(unittest.TestCase):
+    address_strat = st.integers(min_value=0x8000, max_value=0xFFFF).filter(
+        lambda a: not (0xA000 <= a < 0xC000 or 0xFEA0 <= a < 0xFF00 or 0xFF40 <= a < 0xFF4C)
+    )
+    value_strat = st.integers(min_value=0, max_value=255)
+
+    @given(address_strat, value_strat)
+    def test_read_write(self, address, value):
+        memory.write(address, value)
+        self.assertEqual(memory.read(address), value)
+
+    @given(st.integers(min_value=0xE000, max_value=0xFDFF), value_strat)
+    def test_echo_ram(self, address, value):
+        memory.write(address, value)
+        self.assertEqual(memory.read(address - 0x2000), value)
+
+    def test_regions(self):
+        memory.write(0x8000, 0x12)
+        memory.write(0xFF80, 0x34)
+        memory.write(0xFFFF, 0x56)
+        self.assertEqual(memory.v_ram.data[0], 0x12)
+        self.assertEqual(memory.z_ram.data[0], 0x34)
+        self.assertEqual(memory.ie.data[0], 0x56)
+        self.assertEqual(memory.read(0xFEA0), 0)
+
+    def test_tile_dirty(self):
+        memory.tile_dirty[:] = bytes(len(memory.tile_dirty))
+        memory.write(0x8010, 0x12)
+        memory.write(0x9800, 0x34)  # the tile maps aren't tile data
+        self.assertEqual(memory.v_ram.data[0x10], 0x12)
+        self.assertEqual(list(memory.tile_dirty[:3]), [0, 1, 0])
+        memory.write_block(0x80FF, bytes(0x12))
+        self.assertEqual(memory.tile_dirty.count(1), 4)
+        self.assertTrue(all(memory.tile_dirty[0x0F:0x12]))
+
+    def test_bank_switch(self):
+        rom = bytearray(0x10000)
+        rom[0x147], rom[0x148], rom[0x149] = 0x03, 0x01, 0x02
+        for bank in range(4):
+            rom[bank * 0x4000] = bank
+        # the cart has a battery, so its save goes somewhere that's thrown away afterwards
+        saves = tempfile.TemporaryDirectory()
+        self.addCleanup(saves.cleanup)
+        memory.load_cartridge(rom, saves.name)
+        try:
+            self.assertEqual(memory.read(0x0000), 0)
+            self.assertEqual(memory.read(0x4000), 1)
+            memory.write(0x2000, 3)
+            self.assertEqual(memory.read(0x4000), 3)
+            self.assertEqual(bytes(memory.cart.read_block(0x3FFF, 2)), bytes([0, 3]))
+            self.assertEqual(bytes(memory.read_block(0x3FFF, 2)), bytes([0, 3]))
+            memory.write(0xA000, 0x42)
+            self.assertEqual(memory.read(0xA000), 0xFF)
+            memory.write(0x0000, 0x0A)
+            self.assertEqual(memory.read(0xA000), 0x00)
+            memory.write(0xA000, 0x42)
+            self.assertEqual(memory.cart.active_ram_bank[0], 0x42)
+            self.assertIs(memory.cart.active_rom_bank.obj, rom)
+            self.assertIs(memory.cart.active_ram_bank.obj, memory.cart.ram)
+        finally:
+            memory.unload_cartridge()
+
+    @given(st.integers(min_value=0x8000, max_value=0x9F00), st.binary(min_size=1, max_size=0x100))
+    def test_block(self, address, data):
+        ComponentEvents.RequestMemoryWriteBlock(address, data)
+        self.assertEqual(bytes(ComponentEvents.RequestMemoryReadBlock.request_data(address, len(data))), data)
+        self.assertEqual(memory.read(address + len(data) - 1), data[-1])
+
+    def test_block_across_regions(self):
+        data = bytes(range(0x40))
+        memory.write_block(0xFFE0, data[:0x1F])
+        memory.write_block(0xFE80, data[:0x20])
+        self.assertEqual(bytes(memory.read_block(0xFFE0, 0x1F)), data[:0x1F])
+        self.assertEqual(bytes(memory.read_block(0xFE80, 0x30)), data[:0x20] + bytes(0x10))
+        memory.write_block(0xDFF0, data[:0x20])
+        self.assertEqual(bytes(memory.w_ram.read_block(0xDFF0, 0x10)), data[:0x10])
+        self.assertEqual(bytes(memory.read_block(0xFE00 - 0x10, 0x10)), bytes(memory.read_block(0xDDF0, 0x10)))
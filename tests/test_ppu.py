@@ -0,0 +1,116 @@
+import unittest
+
+from project.src.system import set_value, SystemEvents, ComponentEvents
+from project.src.components import memory, ppu
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+# low plane 0xF0 and high plane 0xCC give colours 3, 3, 1, 1, 2, 2, 0, 0
+TILE_ROW = bytes([0xF0, 0xCC])
+PATTERN = [3, 3, 1, 1, 2, 2, 0, 0]
+
+
+class TestPPU(unittest.TestCase):
+    def setUp(self):
+        memory.write_block(0x8000, bytes(0x2000))
+        memory.write_block(0xFE00, bytes(0xA0))
+        ppu.boot()
+        memory.write(0xFF47, 0xE4)  # colours map straight to shades
+        memory.write_block(0x8010, TILE_ROW * 8)  # tile 1
+
+    def tearDown(self):
+        memory.write(0xFF40, 0x00)
+        ComponentEvents.RequestReset()
+
+    def test_background(self):
+        memory.write(0x9800, 1)
+        ppu.render_line(0)
+        self.assertEqual(ppu.framebuffer[0, :10].tolist(), PATTERN + [0, 0])
+
+    def test_scroll(self):
+        memory.write(0x9800, 1)
+        memory.write(0xFF43, 2)  # SCX
+        ppu.render_line(0)
+        self.assertEqual(ppu.framebuffer[0, :6].tolist(), PATTERN[2:])
+        self.assertEqual(ppu.framebuffer[0, -2:].tolist(), [0, 0])
+
+    def test_signed_tile_data(self):
+        memory.write_block(0x8FF0, TILE_ROW * 8)  # tile -1 from 0x9000
+        memory.write(0x9800, 0xFF)
+        memory.write(0xFF40, 0x81)
+        ppu.render_line(0)
+        self.assertEqual(ppu.framebuffer[0, :8].tolist(), PATTERN)
+
+    def test_window(self):
+        memory.write(0x9C00, 1)
+        memory.write(0xFF40, 0xF1)  # window on, using the 0x9C00 map
+        memory.write(0xFF4A, 4)  # WY
+        memory.write(0xFF4B, 7 + 16)  # WX
+        ppu.render_line(3)
+        self.assertEqual(ppu.framebuffer[3, 16:24].tolist(), [0] * 8)
+        ppu.render_line(4)
+        self.assertEqual(ppu.framebuffer[4, 16:24].tolist(), PATTERN)
+
+    def test_sprites(self):
+        memory.write(0xFF40, 0x93)
+        memory.write(0xFF48, 0xE4)  # OBP0
+        memory.write_block(0xFE00, bytes([16, 8, 1, 0x20, 16, 10, 1, 0x00]))
+        ppu.render_line(0)
+        # the sprite further left is on top where they overlap, and the first one is mirrored
+        self.assertEqual(ppu.framebuffer[0, :12].tolist(), PATTERN[::-1] + PATTERN[6:] + [0, 0])
+
+    def test_sprite_behind_background(self):
+        memory.write(0xFF40, 0x93)
+        memory.write(0xFF48, 0xFF)
+        memory.write(0x9800, 1)
+        memory.write_block(0x8020, bytes([0xFF, 0x00]))  # a row of colour 1 in tile 2
+        memory.write_block(0xFE00, bytes([16, 8, 2, 0x80]))
+        ppu.render_line(0)
+        self.assertEqual(ppu.framebuffer[0, :8].tolist(), [3, 3, 1, 1, 2, 2, 3, 3])
+
+    def test_frame_timing(self):
+        lines, frames = set(), 0
+        memory.write(0xFF0F, 0)
+        for _ in range(ppu.CYCLES_PER_FRAME // 4):
+            lines.add(memory.read(0xFF44))
+            frames += ppu.advance(4)
+            if memory.read(0xFF44) == 144:
+                self.assertEqual(memory.read(0xFF41) & 0x03, ppu.VBLANK)
+        self.assertEqual(frames, 1)
+        self.assertEqual(lines, set(range(154)))
+        self.assertEqual(memory.read(0xFF44), 0)
+        self.assertTrue(memory.read(0xFF0F) & 0x01)
+
+    def test_registers(self):
+        memory.write(0xFF44, 0x12)
+        self.assertEqual(memory.read(0xFF44), 0)
+        memory.write(0xFF45, 0)
+        self.assertEqual(memory.read(0xFF41) & 0x84, 0x84)
+        memory.write_block(0xC000, bytes(range(0xA0)))
+        memory.write(0xFF46, 0xC0)
+        self.assertEqual(bytes(memory.oam.data), bytes(range(0xA0)))
+
+    def test_lcd_off(self):
+        memory.write(0x9800, 1)
+        ppu.render_line(0)
+        memory.write(0xFF40, 0x11)
+        self.assertFalse(ppu.framebuffer.any())
+        self.assertFalse(ppu.advance(ppu.CYCLES_PER_FRAME - 1))
+        self.assertTrue(ppu.advance(1))
+
+    def test_tile_cache(self):
+        memory.write(0x9800, 1)
+        ppu.render_line(0)
+        ppu.tile_cache.reset_stats()
+        ppu.render_line(1)
+        self.assertEqual(ppu.tile_cache.decoded, 0)
+        memory.write(0x8014, 0xFF)  # the low plane of tile 1, row 2
+        ppu.render_line(2)
+        self.assertEqual(ppu.tile_cache.decoded, 1)
+        self.assertEqual(ppu.framebuffer[2, :8].tolist(), [3, 3, 1, 1, 3, 3, 1, 1])
+        ppu.render_line(3)
+        # three lines of 32 tile rows, and only the read of tile 1 on line 2 waited on a decode
+        stats = ComponentEvents.RequestTileCacheStats.request_data()
+        self.assertEqual((stats["lookups"], stats["misses"], stats["decoded"]), (96, 1, 1))
+        self.assertEqual(stats["hit_rate"], 1 - 1 / 96)
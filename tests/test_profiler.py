@@ -0,0 +1,42 @@
+import unittest
+
+from project.src.system import set_value, SystemEvents, ComponentEvents
+from project.src.components import cpu, memory, register
+from project.src.profiler import SamplingProfiler, _region
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class TestProfiler(unittest.TestCase):
+    def test_collapsed_stacks(self):
+        ComponentEvents.RequestReset()
+        memory.write_block(0xC000, bytes([0x3C, 0x18, 0xFD]))  # INC A, JR -3
+        register.registry.PC = 0xC000
+        with SamplingProfiler(0.0005) as profiler:
+            while not profiler.samples:
+                cpu.run(10_000)
+        for line in profiler.collapsed().splitlines():
+            stack, weight = line.rsplit(" ", 1)
+            region, pc_range, opcode, subsystem, function = stack.split(";")
+            self.assertEqual(region, "wram")
+            self.assertEqual(pc_range, "pc C000-C0FF")
+            self.assertIn(subsystem, ("CPU", "memory", "bus", "other"))
+            self.assertGreaterEqual(int(weight), 0)
+
+    def test_attribution(self):
+        ComponentEvents.RequestReset()
+        # a busy loop that never leaves 0xFF80-0xFF82: INC A, JR -3
+        memory.write_block(0xFF80, bytes([0x3C, 0x18, 0xFD]))
+        register.registry.PC = 0xFF80
+        with SamplingProfiler(0.0005, pc_granularity=0x10) as profiler:
+            while sum(profiler.samples.values()) < 20 * 500:
+                cpu.run(10_000)
+        # every sample is worth one interval, however late the sampler got to it
+        self.assertEqual({weight % 500 for weight in profiler.samples.values()}, {0})
+        self.assertEqual({stack[:2] for stack in profiler.samples}, {("hram", "pc FF80-FF8F")})
+
+    def test_regions(self):
+        regions = {0x0100: "bank 00", 0x8000: "vram", 0xA000: "cart ram", 0xC000: "wram", 0xE000: "wram", 0xFE00: "oam",
+                   0xFEA0: "unusable", 0xFF00: "io", 0xFF7F: "io", 0xFF80: "hram", 0xFFFE: "hram", 0xFFFF: "ie"}
+        self.assertEqual({pc: _region(pc) for pc in regions}, regions)
@@ -34,4 +34,18 @@ class TestRegister(unittest.TestCase):
     def test_stack_pointer_program_counter(self, register, value):
         self._test(register, value)
 
+    @given(register_strat_16_bit, value_strat_16_bit)
+    def test_16_bit_pairs(self, register, value):
+        self.WRITE_EVENT(register, value)
+        self.assertEqual(self.READ_EVENT.request_data(register[0]), value >> 8)
+        self.assertEqual(self.READ_EVENT.request_data(register[1]), value & 0xFF)
+
+    @given(st.sampled_from(["FZ", "FN", "FH", "FC"]), st.integers(min_value=0, max_value=1), value_strat_8_bit)
+    def test_flags(self, flag, value, f):
+        self.WRITE_EVENT("F", f)
+        self.WRITE_EVENT(flag, value)
+        bit = 7 - ["FZ", "FN", "FH", "FC"].index(flag)
+        self.assertEqual(self.READ_EVENT.request_data(flag), value)
+        self.assertEqual(self.READ_EVENT.request_data("F"), f & ~(1 << bit) | value << bit)
+
     ComponentEvents.RequestReset()
@@ -0,0 +1,46 @@
+from hypothesis import given, strategies as st
+import unittest
+
+from project.src.system import set_value, SystemEvents, ComponentEvents
+from project.src.components import memory, rewind
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class TestRewind(unittest.TestCase):
+    @given(st.lists(st.binary(min_size=64, max_size=64), min_size=1, max_size=20))
+    def test_buffer(self, snapshots):
+        buffer = rewind.RewindBuffer(1 << 20)
+        for snapshot in snapshots:
+            buffer.push(snapshot)
+        self.assertEqual(len(buffer), len(snapshots))
+        for snapshot in reversed(snapshots[:-1]):
+            self.assertEqual(buffer.pop(), snapshot)
+        self.assertEqual(buffer.pop(), snapshots[0])
+
+    def test_budget(self):
+        buffer = rewind.RewindBuffer(4096, level=0)
+        for value in range(100):
+            buffer.push(bytes([value]) * 1024)
+        self.assertLessEqual(buffer.size, 4096)
+        self.assertLess(len(buffer), 100)
+        self.assertEqual(buffer.latest, bytes([99]) * 1024)
+
+    def test_rewind(self):
+        set_value("rewind", "enabled", True)
+        set_value("rewind", "interval frames", 2)
+        SystemEvents.SettingsUpdated()
+        try:
+            for frame in range(6):
+                memory.write(0xC000, frame)
+                ComponentEvents.FrameCompleted()
+            self.assertEqual(len(rewind.buffer), 3)
+            self.assertTrue(rewind.rewind())
+            self.assertEqual(memory.read(0xC000), 3)
+            ComponentEvents.RequestRewind(1)
+            self.assertEqual(memory.read(0xC000), 1)
+        finally:
+            set_value("rewind", "enabled", False)
+            SystemEvents.SettingsUpdated()
+        self.assertFalse(rewind.rewind())
@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from project.src.system import set_value, SystemEvents
+from project.src.structs import rom_data
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class TestRomData(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.rom = bytearray(range(256)) * 0x100
+        self.rom[0x148] = 0x00
+        self.rom = bytes(self.rom[:0x8000])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_map_rom(self):
+        file = self.path / "test.gb"
+        file.write_bytes(self.rom)
+        mapped = rom_data.map_rom(file)
+        self.assertEqual(mapped[:], self.rom)
+        with self.assertRaises(TypeError):
+            mapped[0] = 0
+        mapped.close()
+
+    def _zipped(self, rom: bytes) -> memoryview:
+        file = self.path / "test.zip"
+        with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("test.gb", rom)
+        with zipfile.ZipFile(file) as zip_file:
+            return rom_data.read_zipped_rom(zip_file, zip_file.getinfo("test.gb"))
+
+    def test_read_zipped_rom(self):
+        data = self._zipped(self.rom)
+        self.assertEqual(len(data.obj), 0x8000)
+        self.assertEqual(bytes(data), self.rom)
+
+    def test_read_zipped_rom_ignores_header_size(self):
+        # an unknown size code, then a header declaring 32 KiB on a 64 KiB file
+        unknown = self.rom[:0x148] + bytes([0xFF]) + self.rom[0x149:]
+        self.assertEqual(bytes(self._zipped(unknown)), unknown)
+        larger = self.rom * 2
+        self.assertEqual(bytes(self._zipped(larger)), larger)
@@ -0,0 +1,76 @@
+from hypothesis import given, strategies as st
+import struct
+import unittest
+
+from project.src.system import set_value, SystemEvents, ComponentEvents
+from project.src.components import cpu, memory, ppu, register, save_state
+
+set_value("developer", "debug logging", False)
+SystemEvents.SettingsUpdated()
+
+
+class TestSaveState(unittest.TestCase):
+    def setUp(self):
+        rom = bytearray(0x20000)
+        rom[0x147], rom[0x148], rom[0x149] = 0x1A, 0x02, 0x03
+        ComponentEvents.RomLoaded(rom)
+        memory.write(0x0000, 0x0A)
+
+    def tearDown(self):
+        memory.unload_cartridge()
+
+    @given(st.integers(min_value=0, max_value=0xFFFF), st.integers(min_value=1, max_value=7), st.binary(min_size=16, max_size=16))
+    def test_round_trip(self, pc, bank, data):
+        register.registry.PC = pc
+        cpu.state.cycles = pc * 4
+        memory.write(0x2000, bank)
+        memory.write(0x4000, bank & 3)
+        memory.write_block(0xA000, data)
+        memory.write_block(0xC000, data)
+        memory.write_block(0xFF80, data)
+        ppu.state.mode, ppu.state.remaining, ppu.state.window_line = ppu.DRAWING, pc % 456 - 228, bank
+        state = save_state.capture()
+        v_ram = memory.v_ram.data
+
+        register.registry.PC = 0
+        cpu.state.cycles = 0
+        memory.write(0x2000, 1)
+        memory.write(0x4000, 0)
+        memory.write_block(0xC000, bytes(16))
+        memory.write_block(0xFF80, bytes(16))
+        ppu.state.reset()
+        save_state.restore(state)
+
+        self.assertEqual(register.registry.PC, pc)
+        self.assertEqual(cpu.state.cycles, pc * 4)
+        self.assertEqual((ppu.state.mode, ppu.state.remaining, ppu.state.window_line), (ppu.DRAWING, pc % 456 - 228, bank))
+        self.assertEqual(memory.cart.rom_bank, bank)
+        self.assertEqual(bytes(memory.read_block(0xA000, 16)), data)
+        self.assertEqual(bytes(memory.read_block(0xC000, 16)), data)
+        self.assertEqual(bytes(memory.read_block(0xFF80, 16)), data)
+        self.assertIs(memory.v_ram.data, v_ram)
+        self.assertEqual(save_state.capture(), state)
+
+    def test_rejects_other_states(self):
+        state = bytearray(save_state.capture())
+        state[4] = 0xFF
+        with self.assertRaises(ValueError):
+            save_state.restore(state)
+        with self.assertRaises(ValueError):
+            save_state.restore(bytes(len(state)))
+
+    def test_rejects_version_1(self):
+        state = bytearray(save_state.capture())
+        struct.pack_into("<H", state, 4, 1)
+        with self.assertRaisesRegex(ValueError, "no PPU state"):
+            save_state.restore(state)
+
+    def test_restore_rebuilds_sprites(self):
+        memory.write_block(0xFE00, bytes([16, 8, 1, 0]))
+        state = save_state.capture()
+        memory.write_block(0xFE00, bytes(4))
+        ppu._sprites = ppu._Sprites(8)
+        memory.tile_dirty[:] = bytes(len(memory.tile_dirty))
+        save_state.restore(state)
+        self.assertIsNone(ppu._sprites)
+        self.assertTrue(all(memory.tile_dirty))